@@ -0,0 +1,131 @@
+# Startup benchmark for short-lived processes that use the SQLiteRALFramework.
+# Every run starts a fresh python process that imports ral_network, opens an existing database writable or read-only,
+# optionally warms it up and runs the first search. The durations of these phases are recorded separately.
+# The reading part of the warm-up only pays off when the page cache of the operating system is cold, for example after dropping it between the runs.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.benchmark_startup --sizes 1000 10000 --output startup.json
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from ral_network import RALFramework, SQLiteRALFramework, saveRALJData
+from .network_generators import generatorsByShape
+
+repositoryDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+phases = ["importPackage", "importBackend", "open", "warmUp", "firstSearch"]
+
+childScript = """
+import json, sys
+from time import perf_counter
+arguments = json.loads(sys.argv[1])
+times = [perf_counter()]
+import ral_network
+times.append(perf_counter())
+from ral_network import SQLiteRALFramework
+times.append(perf_counter())
+framework = SQLiteRALFramework(arguments["path"], readOnly = arguments["readOnly"])
+times.append(perf_counter())
+if arguments["warmUp"]:
+    framework.warmUp()
+times.append(perf_counter())
+numberOfResults = len(list(framework.search(**arguments["search"], resultMode = "ids")))
+times.append(perf_counter())
+print(json.dumps({"seconds": [end - start for start, end in zip(times, times[1:])], "numberOfResults": numberOfResults}))
+"""
+
+def getPortableSearch(search):
+    """
+    Replaces the data abstractions of the search keyword arguments by parameters of the data block, so that the search can be passed to another process.
+    """
+    data = {**search.get("data", {})}
+    def portable(item):
+        if type(item) == str or type(item) == int:
+            return item
+        parameter = f"fixed {item.data} {item.format}"
+        data[parameter] = [item.data, item.format]
+        return parameter
+    return {
+        "triples": [[portable(item) for item in triple] for triple in search.get("triples", [])],
+        "constructed": {parameter : [connection if connection == "+" else [portable(item) for item in connection] for connection in connections] for parameter, connections in search.get("constructed", {}).items()},
+        "data": data}
+
+def createDatabase(path, shape, size):
+    """
+    Creates the sqlite database of a network of the given shape and size with a bulk import and returns the portable search of the shape.
+    """
+    memoryFramework = RALFramework()
+    network = generatorsByShape[shape](memoryFramework, size)
+    framework = SQLiteRALFramework(path)
+    framework.importRALJData(saveRALJData(network["abstractions"], memoryFramework))
+    search = getPortableSearch(network["search"])
+    # The data abstractions of the search must survive the searches of writable processes
+    for parameter, (data, format) in search["data"].items():
+        if type(data) == str and type(format) == str:
+            framework.DirectDataAbstraction(data, format).remembered = True
+    framework.close()
+    return search
+
+def benchmark(shape, size, repeat, directory):
+    """
+    Returns the result records of all startup phases for one shape and size in the writable, read-only, warmed up read-only and warmed up writable configurations.
+    The warm up of the last configuration stores the statistics of the query planner in the database.
+    """
+    fileDescriptor, path = tempfile.mkstemp(prefix = f"startup_{shape}_{size}_", suffix = ".sqlite", dir = directory)
+    os.close(fileDescriptor)
+    search = createDatabase(path, shape, size)
+    records = []
+    for readOnly, warmUp in [(False, False), (True, False), (True, True), (False, True)]:
+        durationsByPhase = {phase : [] for phase in phases}
+        for i in range(repeat):
+            output = subprocess.run([sys.executable, "-c", childScript, json.dumps({"path": path, "readOnly": readOnly, "warmUp": warmUp, "search": search})],
+                                    cwd = repositoryDirectory, capture_output = True, text = True, check = True).stdout
+            for phase, seconds in zip(phases, json.loads(output)["seconds"]):
+                durationsByPhase[phase].append(seconds)
+        records += [{
+            "shape": shape,
+            "size": size,
+            "readOnly": readOnly,
+            "warmUp": warmUp,
+            "phase": phase,
+            "repeat": repeat,
+            "minSeconds": min(durations),
+            "medianSeconds": statistics.median(durations)}
+            for phase, durations in durationsByPhase.items()]
+    return records
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the import of ral_network and the opening of sqlite databases in fresh processes.")
+    parser.add_argument("--shapes", nargs = "+", choices = list(generatorsByShape), default = ["hub"])
+    parser.add_argument("--sizes", nargs = "+", type = int, default = [1000, 10000])
+    parser.add_argument("--repeat", type = int, default = 5, help = "Number of processes per configuration.")
+    parser.add_argument("--output", help = "Write the results as json to this file instead of stdout.")
+    arguments = parser.parse_args(arguments)
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for shape in arguments.shapes:
+            for size in arguments.sizes:
+                records += benchmark(shape, size, arguments.repeat, directory)
+    results = {
+        "metadata": {
+            "timestamp": time.time(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": arguments.repeat},
+        "results": records}
+    if arguments.output != None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent = 2)
+    else:
+        json.dump(results, sys.stdout, indent = 2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Generators for synthetic RAL networks of representative shapes.
+# Every generator takes a RAL framework and a size and returns a dict with
+#   "abstractions": all created abstractions (they have to be kept alive by the caller),
+#   "roots": the abstractions that exports and transformations start from,
+#   "base": an abstraction whose forced deletion cascades through the generated network,
+#   "search": keyword arguments of a search() call that is typical for the shape.
+
+def generateDeepChain(framework, size):
+    """
+    A chain of size constructed abstractions where every abstraction is built on its predecessor.
+    """
+    next = framework.Node("next", "select")
+    base = framework.Node("chain start")
+    abstractions = [next, base]
+    previous = base
+    for i in range(size):
+        previous = framework.Node([[previous, next, 0]])
+        abstractions.append(previous)
+    return {"abstractions": abstractions, "roots": [previous], "base": base,
+            "search": {"constructed": {"node": [["previous", next, 0]]}}}
+
+def generateHub(framework, size):
+    """
+    size constructed abstractions that all point to the same hub abstraction.
+    """
+    pointsTo = framework.Node("pointsTo", "select")
+    name = framework.Node("name", "select")
+    hub = framework.Node("hub")
+    abstractions = [pointsTo, name, hub]
+    roots = []
+    for i in range(size):
+        leaf = framework.Node(f"leaf {i}")
+        node = framework.Node([[0, pointsTo, hub], [0, name, leaf]])
+        abstractions += [leaf, node]
+        roots.append(node)
+    return {"abstractions": abstractions, "roots": roots, "base": hub,
+            "search": {"triples": [["node", pointsTo, hub], ["node", name, "leaf"]]}}
+
+def generateStar(framework, size):
+    """
+    A single constructed abstraction with size base connections to distinct data abstractions.
+    """
+    contains = framework.Node("contains", "select")
+    leaves = [framework.Node(f"star leaf {i}") for i in range(size)]
+    center = framework.Node([[0, contains, leaf] for leaf in leaves])
+    return {"abstractions": [contains, *leaves, center], "roots": [center], "base": contains,
+            "search": {"triples": [["center", contains, "leaf"]], "data": {"leaf": [["text"], "text"]}}}
+
+def generateClaims(framework, size, nestingDepth = 3):
+    """
+    size abstract concepts that each contain an asserted claim.
+    The claims of consecutive concepts are claims about the previous concept, which contains a claim itself, up to nestingDepth levels.
+    """
+    isA = framework.Node("isA", "select")
+    says = framework.Node("says", "select")
+    concept = framework.Node("concept")
+    abstractions = [isA, says, concept]
+    roots = []
+    previous = None
+    for i in range(size):
+        claim = framework.Node(f"claim {i}", "claim")
+        if i % nestingDepth == 0:
+            node = framework.Node([[0, isA, concept], [claim, says, 0]])
+        else:
+            node = framework.Node([[0, isA, concept], [claim, 0, previous]])
+        abstractions += [claim, node]
+        roots.append(node)
+        previous = node
+    return {"abstractions": abstractions, "roots": roots, "base": isA,
+            "search": {"triples": [["node", isA, concept], ["claim", "relation", "node"]]}}
+
+generatorsByShape = {
+    "chain": generateDeepChain,
+    "hub": generateHub,
+    "star": generateStar,
+    "claims": generateClaims,
+}
@@ -0,0 +1,166 @@
+# Benchmark suite for the RAL frameworks.
+# Times and records the peak memory of node creation, search, RALJ save/load, transformRALNetwork and cascading deletion
+# on synthetic networks for both the in-memory RALFramework and the SQLiteRALFramework.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.run_benchmarks --sizes 100 1000 --output results.json
+#   python -m benchmarks.run_benchmarks --sizes 100 1000 --compare results.json
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from time import perf_counter
+from ral_network import RALFramework, SQLiteRALFramework, loadRALJData, saveRALJData, transformRALNetwork, RALIdentityTransformation, transformAssertedClaimsIntoAbstractClaims
+from .network_generators import generatorsByShape
+
+backends = ["memory", "sqlite"]
+
+class BackendFactory:
+    """
+    Creates fresh frameworks of one backend and closes them again.
+    """
+    def __init__(self, backend, directory):
+        self.backend = backend
+        self.directory = directory
+        self.frameworks = []
+        self.paths = []
+    def __call__(self):
+        if self.backend == "memory":
+            framework = RALFramework()
+        else:
+            # Every framework gets a new database, so that no run reuses the rows of an earlier one
+            fileDescriptor, path = tempfile.mkstemp(suffix = ".sqlite", dir = self.directory)
+            os.close(fileDescriptor)
+            self.paths.append(path)
+            framework = SQLiteRALFramework(path)
+        self.frameworks.append(framework)
+        return framework
+    def closeAll(self):
+        for framework in self.frameworks:
+            if self.backend == "sqlite":
+                framework.close()
+        self.frameworks = []
+        for path in self.paths:
+            for suffix in ["", "-wal", "-shm", "-journal"]:
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        self.paths = []
+
+def runScenario(newFramework, shape, size, measure):
+    """
+    Runs all operations on a network of the given shape and size and calls measure(operationName, operation) for each of them.
+    The results of the operations are kept alive until the end, so that their garbage collection is not measured by the following operations.
+    """
+    framework = newFramework()
+    network = measure("create", lambda: generatorsByShape[shape](framework, size))
+    measure("search", lambda: list(framework.search(**network["search"])))
+    raljData = measure("saveRALJ", lambda: saveRALJData(network["roots"], framework))
+    loadTarget = newFramework()
+    loaded = measure("loadRALJ", lambda: loadRALJData(raljData, loadTarget))
+    transformTarget = newFramework()
+    transformed = measure("transformRALNetwork", lambda: transformRALNetwork(network["roots"], framework, transformTarget, RALIdentityTransformation))
+    if shape == "claims":
+        claimTarget = newFramework()
+        abstractClaims = measure("transformAssertedClaims", lambda: transformAssertedClaimsIntoAbstractClaims(network["roots"], framework, claimTarget))
+    measure("cascadingDeletion", lambda: network["base"].forceDeletion())
+
+def benchmark(backend, shape, size, repeat, directory):
+    """
+    Returns the result records of all operations for one backend, shape and size.
+    The durations are measured in repeat untraced runs and the peak memory in one additional run traced by tracemalloc.
+    """
+    durationsByOperation = {}
+    peakMemoryByOperation = {}
+    def timedMeasure(operationName, operation):
+        gc.collect()
+        startTime = perf_counter()
+        result = operation()
+        durationsByOperation.setdefault(operationName, []).append(perf_counter() - startTime)
+        return result
+    def tracedMeasure(operationName, operation):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = operation()
+            peakMemoryByOperation[operationName] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+    for measure in [*[timedMeasure] * repeat, tracedMeasure]:
+        factory = BackendFactory(backend, directory)
+        try:
+            runScenario(factory, shape, size, measure)
+        finally:
+            factory.closeAll()
+    return [{
+        "backend": backend,
+        "shape": shape,
+        "size": size,
+        "operation": operationName,
+        "repeat": len(durations),
+        "minSeconds": min(durations),
+        "medianSeconds": statistics.median(durations),
+        "peakMemoryBytes": peakMemoryByOperation.get(operationName)}
+        for operationName, durations in durationsByOperation.items()]
+
+def compareResults(baselineResults, results):
+    """
+    Returns the ratio of the median durations and the peak memory of the results relative to the baseline results for all matching records.
+    """
+    key = lambda record: (record["backend"], record["shape"], record["size"], record["operation"])
+    baselineRecords = {key(record): record for record in baselineResults["results"]}
+    comparison = []
+    for record in results["results"]:
+        baselineRecord = baselineRecords.get(key(record))
+        if baselineRecord == None:
+            continue
+        comparison.append({
+            "backend": record["backend"],
+            "shape": record["shape"],
+            "size": record["size"],
+            "operation": record["operation"],
+            "medianSecondsRatio": record["medianSeconds"] / baselineRecord["medianSeconds"] if baselineRecord["medianSeconds"] > 0 else None,
+            "peakMemoryRatio": record["peakMemoryBytes"] / baselineRecord["peakMemoryBytes"] if baselineRecord["peakMemoryBytes"] else None})
+    return comparison
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the RAL frameworks on synthetic networks.")
+    parser.add_argument("--backends", nargs = "+", choices = backends, default = backends)
+    parser.add_argument("--shapes", nargs = "+", choices = list(generatorsByShape), default = list(generatorsByShape))
+    parser.add_argument("--sizes", nargs = "+", type = int, default = [100, 500])
+    parser.add_argument("--repeat", type = int, default = 3, help = "Number of timed runs per benchmark.")
+    parser.add_argument("--output", help = "Write the results as json to this file instead of stdout.")
+    parser.add_argument("--compare", help = "Compare the results with the results json file of an earlier run.")
+    arguments = parser.parse_args(arguments)
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in arguments.backends:
+            for shape in arguments.shapes:
+                for size in arguments.sizes:
+                    records += benchmark(backend, shape, size, arguments.repeat, directory)
+    results = {
+        "metadata": {
+            "timestamp": time.time(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": arguments.repeat},
+        "results": records}
+    if arguments.compare != None:
+        with open(arguments.compare, "r") as file:
+            results["comparison"] = compareResults(json.load(file), results)
+    if arguments.output != None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent = 2)
+    else:
+        json.dump(results, sys.stdout, indent = 2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,36 @@
 #from .neo4j_ral_framework import Neo4jRALFramework
-from .ralj_loader import loadRALJFile, loadRALJData, saveRALJFile, saveRALJData
 #from .navigator import *
 #from .network_tools import *
 #from .ral_vocabulary import *
-from .ral_framework import *
-from .sqlite_ral_framework import SQLiteRALFramework
-from .network_transformation import *
-#from .ral_library import *
\ No newline at end of file
+#from .ral_library import *
+# The submodules are imported on the first access of one of their names (PEP 562), so that importing ral_network
+# does not import the sqlite, sharding and transformation code that a short-lived process does not use.
+from importlib import import_module
+
+_moduleNamesByAttribute = {
+    **dict.fromkeys(["loadRALJFile", "loadRALJData", "saveRALJFile", "saveRALJData", "loadRALJDeltaFile", "saveRALJDeltaFile"], "ralj_loader"),
+    **dict.fromkeys(["RALFramework", "depthFirstPostOrder", "getParameterValuesOfMatch", "searchAllSearchModules", "estimateNumberOfMatchingTriples",
+                     "TripleSearchModule", "ConstructedSearchModule", "DataSearchModule"], "ral_framework"),
+    **dict.fromkeys(["dataAbstractionHash", "constructedAbstractionHash"], "structural_hash"),
+    **dict.fromkeys(["SearchProfile", "FrameworkCounters", "explainSearchModules", "estimateNumberOfRows"], "search_instrumentation"),
+    **dict.fromkeys(["searchAllSearchModulesInBatches"], "batch_search"),
+    **dict.fromkeys(["getDataMatch", "matchesData", "DataTextIndex"], "data_text_search"),
+    **dict.fromkeys(["SQLiteRALFramework"], "sqlite_ral_framework"),
+    **dict.fromkeys(["transformRALNetwork", "RALIdentityTransformation", "transformAssertedClaimsIntoAbstractClaims", "transformAbstractClaimsIntoAssertedClaims"], "network_transformation"),
+    **dict.fromkeys(["mergeRALNetworks"], "network_merge"),
+    **dict.fromkeys(["ShardedRALFramework"], "sharded_ral_framework"),
+    **dict.fromkeys(["TieredRALFramework"], "tiered_ral_framework"),
+    **dict.fromkeys(["MaterializedView"], "materialized_view")}
+
+__all__ = [*_moduleNamesByAttribute]
+
+def __getattr__(name):
+    if name not in _moduleNamesByAttribute:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module("." + _moduleNamesByAttribute[name], __name__), name)
+    # Later accesses do not go through __getattr__ again
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_moduleNamesByAttribute))
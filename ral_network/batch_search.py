@@ -0,0 +1,124 @@
+# A set-at-a-time executor for the search modules of both RAL frameworks.
+# searchAllSearchModules extends one parameter combination at a time. searchAllSearchModulesInBatches instead uses the search modules
+# in a fixed order and extends batches of parameter combinations, which are stored column-wise, by hash joins with the module results.
+# A module is searched once per distinct combination of the known parameters it depends on. If a batch has more than fullScanThreshold
+# distinct combinations and the module allows it, the module is searched once without known parameters
+# and its results are hash joined with all batches. With useNumpy the matching of single integer key columns is vectorized with numpy.
+
+def searchAllSearchModulesInBatches(searchModules, knownParameters, profile = None, batchSize = 10000, fullScanThreshold = 1000, useNumpy = False):
+    """
+    Return all filled parameter combinations for the given modules like searchAllSearchModules.
+    """
+    numpy = importNumpy() if useNumpy else None
+    orderedSearchModules = orderSearchModules(searchModules, knownParameters)
+    columns = {name : [value] for name, value in knownParameters.items()}
+    fullScanResultsByModule = {}
+    for columns, numberOfRows in extendBatch(orderedSearchModules, 0, columns, 1, profile, batchSize, fullScanThreshold, fullScanResultsByModule, numpy):
+        names = list(columns)
+        for values in zip(*[columns[name] for name in names]):
+            yield dict(zip(names, values))
+
+def importNumpy():
+    """
+    Returns the numpy module, which is an optional dependency of ral_network (the "numpy" extra).
+    """
+    try:
+        import numpy
+    except ModuleNotFoundError:
+        raise ValueError("numpy is not installed. Install ral_network with the \"numpy\" extra (pip install ral_network[numpy]) to use the numpy executor and result mode.")
+    return numpy
+
+def orderSearchModules(searchModules, knownParameters):
+    """
+    Returns the search modules in the order in which searchAllSearchModules uses them.
+    """
+    knownParameterNames = set(knownParameters)
+    remainingSearchModules = list(searchModules)
+    orderedSearchModules = []
+    while len(remainingSearchModules) > 0:
+        smallestUndefinednessIndex = None
+        chosenSearchModule = None
+        for searchModule in remainingSearchModules:
+            undefinednessIndex = searchModule.getUndefinednessIndex(knownParameterNames)
+            if smallestUndefinednessIndex == None or undefinednessIndex < smallestUndefinednessIndex:
+                smallestUndefinednessIndex = undefinednessIndex
+                chosenSearchModule = searchModule
+        orderedSearchModules.append(chosenSearchModule)
+        knownParameterNames |= chosenSearchModule.parameterNames
+        remainingSearchModules.remove(chosenSearchModule)
+    return orderedSearchModules
+
+def extendBatch(orderedSearchModules, level, columns, numberOfRows, profile, batchSize, fullScanThreshold, fullScanResultsByModule, numpy):
+    """
+    Yields the (columns, numberOfRows) batches that extend the given batch by the search modules from the level on.
+    """
+    if level == len(orderedSearchModules):
+        yield columns, numberOfRows
+        return
+    searchModule = orderedSearchModules[level]
+    for start in range(0, numberOfRows, batchSize):
+        batchColumns = {name : column[start : start + batchSize] for name, column in columns.items()}
+        batchColumns, numberOfBatchRows = joinSearchModule(searchModule, batchColumns, min(batchSize, numberOfRows - start), profile, len(orderedSearchModules) - level, fullScanThreshold, fullScanResultsByModule, numpy)
+        if numberOfBatchRows > 0:
+            yield from extendBatch(orderedSearchModules, level + 1, batchColumns, numberOfBatchRows, profile, batchSize, fullScanThreshold, fullScanResultsByModule, numpy)
+
+def joinSearchModule(searchModule, columns, numberOfRows, profile, numberOfRemainingModules, fullScanThreshold, fullScanResultsByModule, numpy):
+    """
+    Returns the columns and the number of rows of the hash join of the batch with the results of the search module.
+    """
+    dependencyNames = sorted(searchModule.dependencyParameterNames & set(columns))
+    keys = list(zip(*[columns[name] for name in dependencyNames])) if len(dependencyNames) > 0 else [()] * numberOfRows
+    newNames = sorted(searchModule.parameterNames - set(columns))
+    distinctKeys = set(keys)
+    if len(distinctKeys) > fullScanThreshold and searchModule.allowsFullScan:
+        # Search the module once without known parameters and join its results on the known parameters
+        if searchModule not in fullScanResultsByModule:
+            fullScanResultsByModule[searchModule] = list(searchModuleResults(searchModule, {}, profile, numberOfRemainingModules))
+        buildRows = fullScanResultsByModule[searchModule]
+        buildKeys = [tuple([result[name] for name in dependencyNames]) for result in buildRows]
+    else:
+        # Search the module once per distinct combination of the known parameters it depends on
+        buildRows = []
+        buildKeys = []
+        for key in distinctKeys:
+            for result in searchModuleResults(searchModule, dict(zip(dependencyNames, key)), profile, numberOfRemainingModules):
+                buildRows.append(result)
+                buildKeys.append(key)
+    if numpy != None and len(dependencyNames) == 1 and len(buildKeys) > 0 and type(buildKeys[0][0]) == int and type(keys[0][0]) == int:
+        probeIndices, buildIndices = joinIntegerKeysWithNumpy(numpy, [key[0] for key in keys], [key[0] for key in buildKeys])
+    else:
+        # Index the module results by their key and probe them with the rows of the batch
+        buildIndicesByKey = {}
+        for buildIndex, key in enumerate(buildKeys):
+            buildIndicesByKey.setdefault(key, []).append(buildIndex)
+        probeIndices = []
+        buildIndices = []
+        for probeIndex, key in enumerate(keys):
+            for buildIndex in buildIndicesByKey.get(key, ()):
+                probeIndices.append(probeIndex)
+                buildIndices.append(buildIndex)
+    columns = {name : [column[index] for index in probeIndices] for name, column in columns.items()}
+    for name in newNames:
+        columns[name] = [buildRows[index][name] for index in buildIndices]
+    return columns, len(probeIndices)
+
+def searchModuleResults(searchModule, knownParameters, profile, numberOfRemainingModules):
+    if profile == None:
+        return searchModule.search(knownParameters)
+    return profile.profileModuleSearch(searchModule, knownParameters, numberOfRemainingModules)
+
+def joinIntegerKeysWithNumpy(numpy, probeKeys, buildKeys):
+    """
+    Returns the probe indices and the build indices of all pairs of equal keys using a sort merge join.
+    """
+    probeKeys = numpy.asarray(probeKeys, dtype = numpy.int64)
+    buildKeys = numpy.asarray(buildKeys, dtype = numpy.int64)
+    order = numpy.argsort(buildKeys, kind = "stable")
+    sortedBuildKeys = buildKeys[order]
+    firstMatches = numpy.searchsorted(sortedBuildKeys, probeKeys, side = "left")
+    numbersOfMatches = numpy.searchsorted(sortedBuildKeys, probeKeys, side = "right") - firstMatches
+    probeIndices = numpy.repeat(numpy.arange(len(probeKeys)), numbersOfMatches)
+    # Enumerate the matches of every probe key starting at its first match in the sorted build keys
+    matchOffsets = numpy.arange(len(probeIndices)) - numpy.repeat(numpy.cumsum(numbersOfMatches) - numbersOfMatches, numbersOfMatches)
+    buildIndices = order[numpy.repeat(firstMatches, numbersOfMatches) + matchOffsets]
+    return probeIndices.tolist(), buildIndices.tolist()
@@ -0,0 +1,112 @@
+# Prefix, substring and full text matching of the data of data abstractions.
+# In the data block of a search the data can be given as {"prefix": text}, {"substring": text} or {"fulltext": text} instead of a string or [parameter],
+# for example data = {"x": [{"prefix": "ab"}, "text"]}. The matched data can be bound to a parameter with an additional "parameter" item like {"prefix": "ab", "parameter": "d"}.
+# Prefix and substring matches are case sensitive. A full text match requires all words of the text to occur in the data, where words are
+# the case folded runs of letters and digits.
+# The sqlite framework narrows the matches down with its fts5 tables and the in-memory framework with a DataTextIndex.
+
+import re
+from bisect import bisect_left, insort
+from weakref import WeakValueDictionary
+
+dataMatchKinds = ("prefix", "substring", "fulltext")
+
+def getDataMatch(data):
+    """
+    Returns the (kind, text) of a data match dict of the search pattern.
+    """
+    kinds = [kind for kind in dataMatchKinds if kind in data]
+    if len(kinds) != 1 or type(data[kinds[0]]) != str or len(set(data) - {kinds[0], "parameter"}) > 0 or type(data.get("parameter", "")) != str:
+        raise ValueError(f"The data match {data!r} must contain one of the keys {', '.join(dataMatchKinds)} with a string and can contain a parameter name.")
+    return kinds[0], data[kinds[0]]
+
+def getWords(text):
+    return set(re.findall(r"[^\W_]+", text.lower()))
+
+def matchesData(dataMatch, data):
+    kind, text = dataMatch
+    if kind == "prefix":
+        return data.startswith(text)
+    if kind == "substring":
+        return text in data
+    return getWords(text) <= getWords(data)
+
+def escapeGlobPattern(text):
+    return "".join([f"[{character}]" if character in "*?[" else character for character in text])
+
+def getDataMatchConditions(dataMatch, hasFullTextTables):
+    """
+    Returns the sql conditions on the abstractions table that narrow the rows down to the data matches and the parameters of the conditions.
+    The trigram table is used for patterns of at least three characters and the word table for full text matches.
+    """
+    kind, text = dataMatch
+    if kind == "fulltext":
+        words = getWords(text)
+        if not hasFullTextTables or len(words) == 0:
+            return [], []
+        return ["id IN (SELECT rowid FROM abstractionDataWords WHERE abstractionDataWords MATCH ?)"], [" ".join(['"' + word + '"' for word in sorted(words)])]
+    pattern = escapeGlobPattern(text) + "*" if kind == "prefix" else "*" + escapeGlobPattern(text) + "*"
+    conditions, parameters = ["data GLOB ?"], [pattern]
+    if hasFullTextTables and len(text) >= 3:
+        conditions.append("id IN (SELECT rowid FROM abstractionDataTrigrams WHERE data GLOB ?)")
+        parameters.append(pattern)
+    return conditions, parameters
+
+class DataTextIndex:
+    def __init__(self, dataNodes):
+        """
+        Indexes the distinct data strings of the dataNodes in sorted order and by their words.
+        """
+        self._sortedData = []
+        self._nodesByData = {}
+        self._dataByWord = {}
+        for node in dataNodes:
+            self.add(node)
+
+    def add(self, node):
+        nodesByFormat = self._nodesByData.get(node.data)
+        if nodesByFormat == None:
+            nodesByFormat = self._nodesByData[node.data] = WeakValueDictionary()
+            insort(self._sortedData, node.data)
+            for word in getWords(node.data):
+                self._dataByWord.setdefault(word, set()).add(node.data)
+        nodesByFormat[node.format] = node
+
+    def remove(self, node):
+        nodesByFormat = self._nodesByData.get(node.data)
+        if nodesByFormat == None:
+            return
+        nodesByFormat.pop(node.format, None)
+        if len(nodesByFormat) > 0:
+            return
+        del self._nodesByData[node.data]
+        del self._sortedData[bisect_left(self._sortedData, node.data)]
+        for word in getWords(node.data):
+            dataWithWord = self._dataByWord[word]
+            dataWithWord.discard(node.data)
+            if len(dataWithWord) == 0:
+                del self._dataByWord[word]
+
+    def findData(self, dataMatch):
+        """
+        Returns the indexed data strings that match the (kind, text) dataMatch.
+        """
+        kind, text = dataMatch
+        if kind == "prefix":
+            matchingData = []
+            for index in range(bisect_left(self._sortedData, text), len(self._sortedData)):
+                if not self._sortedData[index].startswith(text):
+                    break
+                matchingData.append(self._sortedData[index])
+            return matchingData
+        if kind == "substring":
+            return [data for data in self._sortedData if text in data]
+        words = getWords(text)
+        if len(words) == 0:
+            return [*self._sortedData]
+        # Intersect the data of the rarest word with the data of the other words
+        dataSets = sorted([self._dataByWord.get(word, set()) for word in words], key = len)
+        return [*dataSets[0].intersection(*dataSets[1:])]
+
+    def getNodes(self, data):
+        return [*self._nodesByData.get(data, {}).values()]
@@ -0,0 +1,89 @@
+# A search result set that is kept up to date with the change events of a RAL framework instead of searching the whole pattern again.
+# Every search module returns the parameter values of the results that a created or deleted abstraction can add or remove.
+# A created abstraction adds the results of a search that starts with these parameter values. A deleted abstraction removes all results
+# that contain it or agree with these parameter values and the results that still match are searched again (delete and rederive).
+
+from .ral_framework import searchAllSearchModules
+
+class MaterializedView:
+    def __init__(self, framework, triples = [], data = {}, constructed = {}):
+        """
+        Searches the pattern once in the framework and updates the results with every change event of the framework until the view is closed.
+        """
+        self.framework = framework
+        # Fixed data values are searched like the other parameters, so that the view sees them being created and deleted and does not keep abstractions alive
+        self._searchModules, self._knownParameters = framework._createSearchModules(triples = triples, data = data, constructed = constructed, createDataAbstractions = False)
+        self.parameters = sorted(set(self._knownParameters).union(*[searchModule.parameterNames for searchModule in self._searchModules]))
+        self._parameterIndices = {parameter : index for index, parameter in enumerate(self.parameters)}
+        self._rows = set(self._searchRows({}))
+        self._onUpdate = set()
+        framework.onChange.add(self._applyChange)
+
+    @property
+    def rows(self):
+        """
+        The set of results as tuples of the parameter values in the order of parameters with abstraction keys instead of abstractions.
+        """
+        return self._rows
+
+    @property
+    def results(self):
+        """
+        The list of results as dicts like the ones yielded by search.
+        """
+        return [{parameter : (value if type(value) == str else self.framework._abstractionFromKey(value)) for parameter, value in zip(self.parameters, row)} for row in self._rows]
+
+    @property
+    def onUpdate(self):
+        """
+        The set of functions that are called with the sets of added and removed rows after a change event modified the results.
+        """
+        return self._onUpdate
+
+    def close(self):
+        """
+        Stops updating the results.
+        """
+        self.framework.onChange.discard(self._applyChange)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _searchRows(self, parameterValues):
+        """
+        Yields the rows of all results that contain the given parameter values.
+        """
+        for parameter, value in parameterValues.items():
+            if self._knownParameters.get(parameter, value) != value:
+                return
+        for knownParameters in searchAllSearchModules(self._searchModules, self._knownParameters | parameterValues):
+            yield tuple([knownParameters[parameter] for parameter in self.parameters])
+
+    def _matchesRow(self, parameterValues, row):
+        return all([row[self._parameterIndices[parameter]] == value for parameter, value in parameterValues.items()])
+
+    def _applyChange(self, event):
+        if event["type"] == "rememberedChanged":
+            return
+        parameterValuesOfChange = [parameterValues for searchModule in self._searchModules for parameterValues in searchModule.getParameterValuesOfChange(event)]
+        removedRows = set()
+        if event["type"] == "nodeDeleted":
+            removedRows = set([row for row in self._rows if event["key"] in row or any([self._matchesRow(parameterValues, row) for parameterValues in parameterValuesOfChange])])
+            self._rows -= removedRows
+            # Results that contain the deleted abstraction can not be found again
+            parameterValuesOfChange = [parameterValues for parameterValues in parameterValuesOfChange if event["key"] not in parameterValues.values()]
+        # Search the pattern only around the changed triples
+        addedRows = set()
+        for parameterValues in parameterValuesOfChange:
+            for row in self._searchRows(parameterValues):
+                if row not in self._rows:
+                    self._rows.add(row)
+                    addedRows.add(row)
+        # Rows that are removed and found again did not change
+        addedRows, removedRows = addedRows - removedRows, removedRows - addedRows
+        if len(addedRows) > 0 or len(removedRows) > 0:
+            for updateFunction in [*self._onUpdate]:
+                updateFunction(addedRows, removedRows)
@@ -0,0 +1,122 @@
+# Merge several RALJ files, RALJ data objects and RAL frameworks into one target RAL framework.
+# All inputs are deduplicated structurally by the hashes of their abstractions and inserted level by level in dependency order,
+# so every distinct abstraction is only looked up once in the target framework.
+
+import json
+from .structural_hash import dataAbstractionHash, constructedAbstractionHash
+
+def mergeRALNetworks(sources, targetRALFramework):
+    """
+    Merges the sources into the targetRALFramework and returns a tuple (abstractionsByHash, statistics).
+    Each source is eather a path to a RALJ file, RALJ data or a RAL framework. Remembered abstractions of source frameworks are remembered in the target.
+    abstractionsByHash maps the structural hash of every merged abstraction to the corresponding abstraction of the targetRALFramework.
+    statistics has the form {"data": {format: {"new": int, "existing": int}}, "constructed": {"new": int, "existing": int}} and counts every distinct abstraction once.
+    """
+    # Collect the records of all sources by their structural hash
+    recordsByHash = {}
+    rememberedHashes = set()
+    for source in sources:
+        if type(source) == str:
+            with open(source, "r") as file:
+                records = getStructuralRecordsFromRALJData(json.load(file))
+        elif type(source) == list:
+            records = getStructuralRecordsFromRALJData(source)
+        else:
+            records = source._getStructuralRecords()
+        for hash, data, format, connectionHashes, remembered in records:
+            if hash not in recordsByHash:
+                recordsByHash[hash] = (data, format, connectionHashes)
+            if remembered:
+                rememberedHashes.add(hash)
+    # Sort the records into dependency levels
+    hashesByLevel = []
+    for hash, level in getDependencyLevels(recordsByHash).items():
+        while len(hashesByLevel) <= level:
+            hashesByLevel.append([])
+        hashesByLevel[level].append(hash)
+    # Insert the missing abstractions level by level
+    statistics = {"data": {}, "constructed": {"new": 0, "existing": 0}}
+    keysByHash = {}
+    for hashes in hashesByLevel:
+        existingKeysByHash = targetRALFramework._findAbstractionKeysByHashes(hashes)
+        keysByHash.update(existingKeysByHash)
+        newRecords = []
+        for hash in hashes:
+            data, format, connectionHashes = recordsByHash[hash]
+            counter = statistics["constructed"] if connectionHashes != None else statistics["data"].setdefault(format, {"new": 0, "existing": 0})
+            if hash in existingKeysByHash:
+                counter["existing"] += 1
+                continue
+            counter["new"] += 1
+            newRecords.append((hash, data, format, None if connectionHashes == None else [[0 if item == 0 else keysByHash[item] for item in triple] for triple in connectionHashes]))
+        if len(newRecords) > 0:
+            keysByHash.update(targetRALFramework._createAbstractionsFromRecords(newRecords))
+    abstractionsByHash = {hash : targetRALFramework._abstractionFromKey(key) for hash, key in keysByHash.items()}
+    for hash in rememberedHashes:
+        abstractionsByHash[hash].remembered = True
+    return abstractionsByHash, statistics
+
+def getStructuralRecordsFromRALJData(data):
+    """
+    Returns a list of (hash, data, format, connectionHashes, remembered) records for all nodes of the RALJ data.
+    """
+    assert type(data) == list and len(data) < 5
+    dataConceptBlock = data[0] if len(data) > 0 else {}
+    constructedConceptBlock = data[1] if len(data) > 1 else {}
+    if len(data) > 2 and (len(data[2]) > 0 or (len(data) > 3 and len(data[3]) > 0)):
+        raise ValueError("Direct abstractions can not be merged.")
+    records = []
+    hashByJsonNodeID = {}
+    for format, dataConcepts in dataConceptBlock.items():
+        for dataString, jsonNodeID in dataConcepts.items():
+            hash = hashByJsonNodeID[jsonNodeID] = dataAbstractionHash(dataString, format)
+            records.append((hash, dataString, format, None, False))
+    for jsonNodeID in constructedConceptBlock:
+        # Compute the hashes of the connected json nodes before the hash of the json node itself
+        stack = [jsonNodeID]
+        visitedJsonNodeIDs = set()
+        while len(stack) > 0:
+            currentJsonNodeID = stack[-1]
+            if currentJsonNodeID in hashByJsonNodeID:
+                stack.pop()
+                continue
+            if currentJsonNodeID not in constructedConceptBlock:
+                raise ValueError(f"The json node {currentJsonNodeID} is not defined.")
+            baseConnections = constructedConceptBlock[currentJsonNodeID]
+            missingJsonNodeIDs = [item for triple in baseConnections for item in triple if item != 0 and item not in hashByJsonNodeID]
+            if len(missingJsonNodeIDs) > 0:
+                if any([item in visitedJsonNodeIDs for item in missingJsonNodeIDs]):
+                    raise ValueError(f"The json node {currentJsonNodeID} depends on itself.")
+                visitedJsonNodeIDs.add(currentJsonNodeID)
+                stack.extend(missingJsonNodeIDs)
+                continue
+            connectionHashes = [[0 if item == 0 else hashByJsonNodeID[item] for item in triple] for triple in baseConnections]
+            hash = hashByJsonNodeID[currentJsonNodeID] = constructedAbstractionHash(connectionHashes)
+            records.append((hash, None, None, connectionHashes, False))
+            stack.pop()
+    return records
+
+def getDependencyLevels(recordsByHash):
+    """
+    Returns the dependency level of every record: 0 for data abstractions and one more than the highest level of the connected abstractions otherwise.
+    """
+    levels = {}
+    for hash in recordsByHash:
+        stack = [hash]
+        while len(stack) > 0:
+            currentHash = stack[-1]
+            if currentHash in levels:
+                stack.pop()
+                continue
+            connectionHashes = recordsByHash[currentHash][2]
+            if connectionHashes == None:
+                levels[currentHash] = 0
+                stack.pop()
+                continue
+            missingHashes = [item for triple in connectionHashes for item in triple if item != 0 and item not in levels]
+            if len(missingHashes) > 0:
+                stack.extend(missingHashes)
+                continue
+            levels[currentHash] = 1 + max([levels[item] for triple in connectionHashes for item in triple if item != 0], default = 0)
+            stack.pop()
+    return levels
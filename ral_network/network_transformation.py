@@ -1,6 +1,7 @@
-def transformRALNetwork(sourceAbstractions, sourceRALFramework, targetRALFramework, transformationFunction):
+def transformRALNetwork(sourceAbstractions, sourceRALFramework, targetRALFramework, transformationFunction, transformedAbstractions = None):
     """
     Transforms the sourceAbstractions from the sourceRALFramework to the targetRALFramework using the transformationFunction and returns a dict that maps each transformed sourceAbstraction to its corresponding targetAbstraction.
+    If a transformedAbstractions dict of earlier transformations with the same transformationFunction is given, its abstractions are not transformed again and the new transformations are added to it.
     The transformationFunction must be a function that takes a sourceAbstraction, the sourceRALFramework and the targetRALFramework as arguments and returns eather:
         - a targetAbstraction
         - a baseConnections object that is build in the following way:
@@ -14,15 +15,18 @@ def transformRALNetwork(sourceAbstractions, sourceRALFramework, targetRALFramewo
         if sourceAbstraction.framework != sourceRALFramework:
             raise ValueError("The sourceAbstractions must be from the sourceRALFramework.")
     # Initialize the transformation
-    finishedTransformations = {}
+    finishedTransformations = transformedAbstractions if transformedAbstractions != None else {}
     unfinishedTransformations = {}
-    uncheckedTransformations = set(sourceAbstractions)
+    uncheckedTransformations = set([sourceAbstraction for sourceAbstraction in sourceAbstractions if sourceAbstraction not in finishedTransformations])
     transformationDependencies = {}
     # Iterate over the uncheckedTransformations
     while len(uncheckedTransformations) > 0:
         # Get the next sourceAbstraction and transform it
         sourceAbstraction = uncheckedTransformations.pop()
-        transformedAbstraction = transformationFunction(sourceAbstraction, sourceRALFramework, targetRALFramework)
+        # The identity transformation of an abstraction that already exists in the target is found by a single hash probe
+        transformedAbstraction = targetRALFramework.getAbstractionFromHash(sourceAbstraction.hash) if transformationFunction == RALIdentityTransformation else None
+        if transformedAbstraction == None:
+            transformedAbstraction = transformationFunction(sourceAbstraction, sourceRALFramework, targetRALFramework)
         # Check if the transformation is a baseConnections object
         if type(transformedAbstraction) in {list, tuple, set, frozenset}:
             transformedAbstraction = [[sub, pred, obj] for sub, pred, obj in transformedAbstraction]
@@ -93,11 +97,15 @@ def RALIdentityTransformation(sourceAbstraction, sourceRALFramework, targetRALFr
     # The sourceAbstraction is a constructed abstraction
     return sourceAbstraction.connections
 
-def transformAssertedClaimsIntoAbstractClaims(abstractConceptsContainingAssertedClaims, sourceRALFramework, targetRALFramework):
+def transformAssertedClaimsIntoAbstractClaims(abstractConceptsContainingAssertedClaims, sourceRALFramework, targetRALFramework, transformedAbstractions = None):
     """
     Transforms the asserted claims of the abstractConceptsContainingAssertedClaims from the sourceRALFramework to the targetRALFramework and returns a set of the transformed abstract claims.
+    A transformedAbstractions dict of an earlier call can be given to continue the transformation in batches.
     """
     claimInformationByAbstractConcept = {}
+    # The format of every connected abstraction is only looked up once
+    isClaim = getFormatCheck("claim")
+    claimedAbstractions = []
     def transformation(sourceAbstraction, sourceRALFramework, targetRALFramework):
         data = sourceAbstraction.data
         if not data == None:
@@ -109,25 +117,28 @@ def transformAssertedClaimsIntoAbstractClaims(abstractConceptsContainingAsserted
         for sub, pred, obj in oldConnections:
             tripleIsClaim = False
             claimInformation = [sub, pred, obj]
-            if sub != 0 and sub.format == "claim":
+            if isClaim(sub):
                 claimInformation[0] = sourceRALFramework.DirectDataAbstraction(sub.data, "abstractClaim")
                 tripleIsClaim = True
-            if pred != 0 and pred.format == "claim":
+            if isClaim(pred):
                 claimInformation[1] = sourceRALFramework.DirectDataAbstraction(pred.data, "abstractClaim")
                 tripleIsClaim = True
-            if obj != 0 and obj.format == "claim":
+            if isClaim(obj):
                 claimInformation[2] = sourceRALFramework.DirectDataAbstraction(obj.data, "abstractClaim")
                 tripleIsClaim = True
             if tripleIsClaim:
                 claimInformationByAbstractConcept.setdefault(sourceAbstraction, []).append(claimInformation)
+                claimedAbstractions.extend([item for item in claimInformation if item != 0])
             else:
                 newConnections.append(claimInformation)
         return newConnections
-    transformedAbstractions = {}
-    untransformedAbstractions = set(abstractConceptsContainingAssertedClaims)
+    # The abstractions inside of the claims are transformed in further passes, but every abstraction is only transformed once
+    transformedAbstractions = {} if transformedAbstractions == None else transformedAbstractions
+    untransformedAbstractions = [*abstractConceptsContainingAssertedClaims]
     while len(untransformedAbstractions) > 0:
-        transformedAbstractions |= transformRALNetwork(untransformedAbstractions, sourceRALFramework, targetRALFramework, transformation)
-        untransformedAbstractions = set([item for triples in claimInformationByAbstractConcept.values() for triple in triples for item in triple if item != 0]).difference(transformedAbstractions.keys())
+        transformRALNetwork(untransformedAbstractions, sourceRALFramework, targetRALFramework, transformation, transformedAbstractions)
+        untransformedAbstractions = [item for item in claimedAbstractions if item not in transformedAbstractions]
+        claimedAbstractions.clear()
     abstractClaims = set()
     isClaimAbout = targetRALFramework.DirectDataAbstraction("isClaimAbout", "select")
     for abstractConcept, claimInformation in claimInformationByAbstractConcept.items():
@@ -136,18 +147,23 @@ def transformAssertedClaimsIntoAbstractClaims(abstractConceptsContainingAsserted
                                                                           (0, isClaimAbout, transformedAbstractions[abstractConcept])}))
     return abstractClaims
 
-def transformAbstractClaimsIntoAssertedClaims(abstractClaims, sourceRALFramework, targetRALFramework):
+def transformAbstractClaimsIntoAssertedClaims(abstractClaims, sourceRALFramework, targetRALFramework, transformedAbstractions = None):
     """
     Transforms the abstract claims of the sourceRALFramework into asserted claims of the targetRALFramework and returns a set of the transformed asserted claims.
+    A transformedAbstractions dict of an earlier call can be given to continue the transformation in batches.
+    The claimed abstraction of every abstract claim is found with one search bound to the abstract claim, so the number of searches grows with the abstract claims and not with the network.
     """
     claimInformationByAbstractConcept = {}
     isClaimAbout = sourceRALFramework.DirectDataAbstraction("isClaimAbout", "select")
-    for abstractClaim in abstractClaims:
+    # The format of every connected abstraction is only looked up once
+    isAbstractClaimData = getFormatCheck("abstractClaim")
+    for abstractClaim in set(abstractClaims):
         claimConnections = abstractClaim.connections
-        connectionToAbstractConcept = [connection for connection in claimConnections if connection[1] == isClaimAbout]
-        if not len(connectionToAbstractConcept) == 1:
+        # Look up the objects of the isClaimAbout connections of the abstract claim, whose subject can be the abstract claim or any other abstraction
+        claimedAbstractions = [result["claimedAbstraction"] for result in sourceRALFramework.search(constructed = {abstractClaim: [["claimSubject", isClaimAbout, "claimedAbstraction"], "+"]})]
+        if not len(claimedAbstractions) == 1:
             raise ValueError("The abstract claim does not make a claim on exactly one abstract concept.")
-        claimedAbstraction = connectionToAbstractConcept[0][2]
+        claimedAbstraction = claimedAbstractions[0]
         claimInformation = None
         for claimConnection in claimConnections:
             if claimConnection[1] == isClaimAbout:
@@ -156,7 +172,7 @@ def transformAbstractClaimsIntoAssertedClaims(abstractClaims, sourceRALFramework
             newClaimInformation = [None, None, None]
             for index, item in enumerate(claimConnection):
                 newClaimInformation[index] = item
-                if item != 0 and item.format == "abstractClaim":
+                if isAbstractClaimData(item):
                     newClaimInformation[index] = sourceRALFramework.DirectDataAbstraction(item.data, "claim")
                     isClaimInformation = True
             if isClaimInformation:
@@ -176,5 +192,18 @@ def transformAbstractClaimsIntoAssertedClaims(abstractClaims, sourceRALFramework
         for claimInformation in claimInformationByAbstractConcept.get(sourceAbstraction, []):
             connections.append(claimInformation)
         return connections
-    transformedAbstractions = transformRALNetwork(set(claimInformationByAbstractConcept.keys()), sourceRALFramework, targetRALFramework, transformation)
+    transformedAbstractions = transformRALNetwork(set(claimInformationByAbstractConcept.keys()), sourceRALFramework, targetRALFramework, transformation, transformedAbstractions)
     return set([transformedAbstractions[abstractConcept] for abstractConcept in claimInformationByAbstractConcept.keys()])
+
+def getFormatCheck(format):
+    """
+    Returns a function that checks if an item of a connection is an abstraction with the given format and remembers the result for every abstraction.
+    """
+    hasFormatByAbstraction = {}
+    def hasFormat(item):
+        if item == 0:
+            return False
+        if item not in hasFormatByAbstraction:
+            hasFormatByAbstraction[item] = item.format == format
+        return hasFormatByAbstraction[item]
+    return hasFormat
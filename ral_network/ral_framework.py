@@ -1,13 +1,41 @@
 from typing import Any
 from weakref import WeakValueDictionary
+from .structural_hash import dataAbstractionHash, constructedAbstractionHash
+from .search_instrumentation import FrameworkCounters, explainSearchModules, estimateNumberOfRows
+from .batch_search import searchAllSearchModulesInBatches
+from .data_text_search import getDataMatch, matchesData, DataTextIndex
 
 class RALFramework:
     def __init__(self):
         self._nodes = WeakValueDictionary()
         self._nodesByIndex = WeakValueDictionary()
+        self._nodesByHash = WeakValueDictionary()
+        self._dataNodesByFormat = {}
+        self._dataTextIndex = None
         self._rememberedNodes = set()
         self._nodeIndexCounter = 0
         self._triples = set()
+        self._counters = FrameworkCounters()
+        self._onChange = set()
+        self._delayedChangeEvents = []
+        self._numberOfActiveDeletions = 0
+
+    @property
+    def counters(self):
+        """
+        The framework wide counters "nodeCreations", "deletedNodes" and "cascadedDeletions".
+        """
+        return self._counters
+
+    @property
+    def onChange(self):
+        """
+        The set of functions that are called with a change event dict whenever a node is created or deleted or its remembered flag changes.
+        The event contains the "type" ("nodeCreated", "nodeDeleted" or "rememberedChanged") and the "key" of the node.
+        The events of created and deleted nodes also contain the "data" and "format" of the node and the (subject, predicate, object) keys of its "triples".
+        The events of changed remembered flags also contain the new "remembered" flag.
+        """
+        return self._onChange
 
     def Node(self, *args):
         """
@@ -22,6 +50,7 @@ class RALFramework:
             else:
                 content = (args[0], args[1])
             isDataNode = True
+            hash = dataAbstractionHash(*content)
         else:
             content = frozenset([tuple(x) for x in args[0]])
             for connection in content:
@@ -29,12 +58,105 @@ class RALFramework:
                 for node in connection:
                     assert type(node) == _RALNode or node == 0
             isDataNode = False
-        if content in self._nodes:
-            return self._nodes[content]
-        else:
-            node = _RALNode(content, isDataNode, self)
+            hash = constructedAbstractionHash([[0 if node == 0 else node.hash for node in connection] for connection in content])
+        # Equal abstractions have equal structural hashes, so a single hash probe finds an existing node
+        node = self._nodesByHash.get(hash)
+        if node is not None:
             return node
+        return self._createNode(content, isDataNode, hash)
+
+    def _getDataTextIndex(self):
+        """
+        Returns the DataTextIndex of the data nodes, which is created by the first prefix, substring or full text search and maintained from then on.
+        """
+        if self._dataTextIndex == None:
+            self._dataTextIndex = DataTextIndex([node for nodesByData in self._dataNodesByFormat.values() for node in nodesByData.values()])
+        return self._dataTextIndex
+
+    def _createNode(self, content, isDataNode, hash):
+        node = _RALNode(content, isDataNode, self, hash)
+        self._emitChange("nodeCreated", node)
+        return node
+
+    def _nodeDeleted(self, node, forced):
+        """
+        Called after a node has been deleted eather by forceDeletion or by the garbage collection.
+        """
+        self._emitChange("nodeDeleted", node)
+
+    def _rememberedChanged(self, node):
+        self._emitChange("rememberedChanged", node)
+
+    def _emitChange(self, eventType, node):
+        if len(self._onChange) == 0:
+            return
+        if eventType == "rememberedChanged":
+            event = {"type": eventType, "key": node, "remembered": node.remembered}
+        else:
+            event = {"type": eventType, "key": node, "data": node.data, "format": node.format,
+                     "triples": [] if node._isDataNode else [tuple([node if item == 0 else item for item in connection]) for connection in node.content]}
+        # The events of cascaded deletions are delayed until the network is consistent again
+        self._delayedChangeEvents.append(event)
+        if self._numberOfActiveDeletions > 0:
+            return
+        delayedChangeEvents = self._delayedChangeEvents
+        self._delayedChangeEvents = []
+        for event in delayedChangeEvents:
+            for changeFunction in [*self._onChange]:
+                changeFunction(event)
     
+    def DirectDataAbstraction(self, data, format):
+        return self.Node(data, format)
+
+    def ConstructedAbstraction(self, baseConnections):
+        return self.Node(baseConnections)
+
+    def isValidAbstraction(self, abstraction):
+        return type(abstraction) == _RALNode and abstraction._RALFramework == self
+
+    def getAbstractionFromHash(self, hash):
+        """
+        Returns the node with the given structural hash or None if there is no such node.
+        """
+        return self._nodesByHash.get(hash)
+
+    def _getStructuralRecords(self):
+        """
+        Yields a (hash, data, format, connectionHashes, remembered) record for every node.
+        """
+        for node in self.getAllNodes():
+            if node._isDataNode:
+                yield (node.hash, node.data, node.format, None, node.remembered)
+            else:
+                yield (node.hash, None, None, [[0 if item == 0 else item.hash for item in connection] for connection in node.content], node.remembered)
+
+    def _findAbstractionKeysByHashes(self, hashes):
+        return {hash : self._nodesByHash[hash] for hash in hashes if hash in self._nodesByHash}
+
+    def _createAbstractionsFromRecords(self, records):
+        """
+        Creates the nodes of the (hash, data, format, connectionKeys) records and returns them by hash.
+        """
+        return {hash : self.Node(data, format) if connectionKeys == None else self.Node(connectionKeys) for hash, data, format, connectionKeys in records}
+
+    def _abstractionFromKey(self, key):
+        return key
+
+    def closure(self, abstractions):
+        """
+        Returns the given nodes and all nodes they are built from in topological order, so that every node comes after the nodes in its base connections.
+        """
+        return depthFirstPostOrder(abstractions, lambda node: [] if node._isDataNode else [item for connection in node.content for item in connection if item != 0])
+
+    def dependents(self, abstractions):
+        """
+        Returns the given nodes and all nodes that are built on them in topological order, so that every node comes after the nodes in its base connections.
+        """
+        nodesByIndex = self._nodesByIndex
+        postOrder = depthFirstPostOrder(abstractions, lambda node: [nodesByIndex[triple[3]] for triple in node._linkedTriples if triple[3] != node._index])
+        postOrder.reverse()
+        return postOrder
+
     def getAllNodes(self):
         return [*self._nodes.values()]
     
@@ -46,13 +168,44 @@ class RALFramework:
         self._nodeIndexCounter += 1
         return self._nodeIndexCounter
     
-    def search(self, triples = [], data = {}, constructed = {}):
+    def search(self, triples = [], data = {}, constructed = {}, profile = None, executor = "recursive"):
+        """
+        Yields all parameter combinations that match the pattern.
+        If a SearchProfile is given as profile, the statistics of the used search modules are recorded in it.
+        executor "recursive" extends one parameter combination at a time and "batch" extends batches of them with hash joins (see batch_search).
+        """
+        searchModules, knownParameters = self._createSearchModules(triples, data, constructed)
+        # Search for all possible parameter combinations
+        if executor == "recursive":
+            yield from searchAllSearchModules(searchModules, knownParameters, profile)
+        elif executor == "batch":
+            yield from searchAllSearchModulesInBatches(searchModules, knownParameters, profile)
+        else:
+            raise ValueError(f"Unknown executor {executor!r}.")
+
+    def explain(self, triples = [], data = {}, constructed = {}):
+        """
+        Returns the steps that a search with the same pattern takes together with the estimated number of rows of each step.
+        """
+        # Explaining a search must not change the network, so fixed data values are searched instead of created
+        searchModules, knownParameters = self._createSearchModules(triples, data, constructed, createDataAbstractions = False)
+        return explainSearchModules(searchModules, knownParameters)
+
+    def materializedView(self, triples = [], data = {}, constructed = {}):
+        """
+        Returns a MaterializedView of the pattern, whose results are updated with the onChange events instead of searching the whole pattern again.
+        """
+        # Imported here, because the materialized view uses the search of this module
+        from .materialized_view import MaterializedView
+        return MaterializedView(self, triples, data, constructed)
+
+    def _createSearchModules(self, triples, data, constructed, createDataAbstractions = True):
         # Create the search modules
         dataBlock, constructedBlock, tripleBlock = data, constructed, triples
         knownParameters = {}
         searchModules = []
         for dataParam, (data, format) in dataBlock.items():
-            if type(data) == str and type(format) == str:
+            if type(data) == str and type(format) == str and createDataAbstractions:
                 knownParameters[dataParam] = self.Node(data, format)
             else:
                 searchModules.append(DataSearchModule(dataParam, data, format, self))
@@ -65,11 +218,11 @@ class RALFramework:
                 searchModules.append(ConstructedSearchModule(constructedParam, baseConnections, i, exactNumberOfBaseConnections, self))
         for subj, pred, obj in tripleBlock:
             searchModules.append(TripleSearchModule(subj, pred, obj, self))
-        # Search for all possible parameter combinations
-        yield from searchAllSearchModules(searchModules, knownParameters)
+        return searchModules, knownParameters
 class _RALNode:
-    def __init__(self, content, isDataNode, RALFramework):
+    def __init__(self, content, isDataNode, RALFramework, hash):
         self.content = content
+        self.hash = hash
         self._isDataNode = isDataNode
         self._remembered = False
         self._RALFramework = RALFramework
@@ -77,6 +230,12 @@ class _RALNode:
         self._linkedTriples = set()
         RALFramework._nodes[content] = self
         RALFramework._nodesByIndex[self._index] = self
+        RALFramework._nodesByHash[hash] = self
+        if isDataNode:
+            RALFramework._dataNodesByFormat.setdefault(content[1], WeakValueDictionary())[content[0]] = self
+            if RALFramework._dataTextIndex != None:
+                RALFramework._dataTextIndex.add(self)
+        RALFramework._counters.increment("nodeCreations")
         if not isDataNode:
             triples = self._myTriples()
             for triple in triples:
@@ -101,12 +260,10 @@ class _RALNode:
         return self.content
     @property
     def data(self):
-        assert self._isDataNode
-        return self.content[0]
+        return self.content[0] if self._isDataNode else None
     @property
     def format(self):
-        assert self._isDataNode
-        return self.content[1]
+        return self.content[1] if self._isDataNode else None
     @property
     def remembered(self):
         return self._remembered
@@ -115,39 +272,111 @@ class _RALNode:
         if self._remembered:
             if not value:
                 self._remembered = False
-                self._RALFramework._rememberedNodes.remove(self)
+                self._RALFramework._rememberedNodes.discard(self)
+                self._RALFramework._rememberedChanged(self)
         else:
             if value:
                 self._remembered = True
                 self._RALFramework._rememberedNodes.add(self)
+                self._RALFramework._rememberedChanged(self)
     @property
     def isDeleted(self):
         return self._RALFramework is None
     def __del__(self):
-        self.forceDeletion()
+        self._delete(False)
     def forceDeletion(self):
+        self._delete(True)
+    def _delete(self, forced):
         if self._RALFramework is None:
             return
+        ralFramework = self._RALFramework
+        ralFramework._numberOfActiveDeletions += 1
+        # Delete all nodes that are built on this node with a worklist instead of recursion, so that long chains do not exceed the recursion limit
+        deletedNodes = []
+        nodesToDelete = [self]
+        while len(nodesToDelete) > 0:
+            node = nodesToDelete.pop()
+            if node._RALFramework is None:
+                continue
+            if node is not self:
+                ralFramework._counters.increment("cascadedDeletions")
+            node._removeFromIndexes()
+            deletedNodes.append(node)
+            for triple in node._linkedTriples:
+                nodeUsingThisNode = ralFramework._nodesByIndex.get(triple[3])
+                if nodeUsingThisNode is not None:
+                    nodesToDelete.append(nodeUsingThisNode)
+        # The nodes built on this node are reported before it, like the nodes they are built on
+        deletedNodes.reverse()
+        for node in deletedNodes:
+            if not node._isDataNode:
+                for triple in node._myTriples():
+                    ralFramework._triples.discard(triple)
+                    for i in range(3):
+                        connectedNode = ralFramework._nodesByIndex.get(triple[i])
+                        if connectedNode is not None:
+                            connectedNode._linkedTriples.discard(triple)
+            # The triples of the nodes built on this node have not been unlinked from it, because it is no longer indexed
+            node._linkedTriples = set()
+        for node in deletedNodes[:-1]:
+            ralFramework._nodeDeleted(node, True)
+        ralFramework._numberOfActiveDeletions -= 1
+        ralFramework._nodeDeleted(self, forced)
+    def _removeFromIndexes(self):
+        """
+        Marks the node as deleted and removes it from the indexes of its framework.
+        """
+        self._RALFramework._counters.increment("deletedNodes")
         self._RALFramework._nodes.pop(self.content)
         self._RALFramework._rememberedNodes.discard(self)
         self._RALFramework._nodesByIndex.pop(self._index)
-        ralFramework = self._RALFramework
+        self._RALFramework._nodesByHash.pop(self.hash)
+        if self._isDataNode:
+            self._RALFramework._dataNodesByFormat[self.content[1]].pop(self.content[0], None)
+            if self._RALFramework._dataTextIndex != None:
+                self._RALFramework._dataTextIndex.remove(self)
         self._RALFramework = None
-        if not self._isDataNode:
-            triples = self._myTriples()
-            for triple in triples:
-                ralFramework._triples.discard(triple)
-                for i in range(3):
-                    connectedNode = ralFramework._nodesByIndex.get(triple[i])
-                    if connectedNode is not None:
-                        connectedNode._linkedTriples.remove(triple)
-                nodeUsingThisNode = ralFramework._nodesByIndex.get(triple[3])
-                if nodeUsingThisNode is not None:
-                    nodeUsingThisNode.forceDeletion()
 
-def searchAllSearchModules(searchModules, knownParameters):
+def depthFirstPostOrder(startNodes, getNeighbours):
+    """
+    Returns all nodes reachable from the startNodes in depth first post order without using recursion.
+    """
+    visited = set()
+    postOrder = []
+    for startNode in startNodes:
+        if startNode in visited:
+            continue
+        visited.add(startNode)
+        stack = [(startNode, iter(getNeighbours(startNode)))]
+        while len(stack) > 0:
+            node, neighbours = stack[-1]
+            for neighbour in neighbours:
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    stack.append((neighbour, iter(getNeighbours(neighbour))))
+                    break
+            else:
+                stack.pop()
+                postOrder.append(node)
+    return postOrder
+
+def getParameterValuesOfMatch(items, values):
+    """
+    Returns the parameter values that make the items, which are parameter names or nodes, match the values or None if they can not match.
+    """
+    parameterValues = {}
+    for item, value in zip(items, values):
+        if type(item) == str:
+            if parameterValues.setdefault(item, value) != value:
+                return None
+        elif item != value:
+            return None
+    return parameterValues
+
+def searchAllSearchModules(searchModules, knownParameters, profile = None):
     """
     Return all filled parameter combinations for the given modules.
+    If a SearchProfile is given, the statistics of the module searches are recorded in it.
     """
     # If there are no modules yield the known parameters
     if len(searchModules) == 0:
@@ -162,13 +391,25 @@ def searchAllSearchModules(searchModules, knownParameters):
             smallestUndefinednessIndex = undefinednessIndex
             moduleWithSmallestNumberOfUnknownParameters = searchModule
     # Iterate through all possible values for the unknown parameters of the module
-    for parameterValues in moduleWithSmallestNumberOfUnknownParameters.search(knownParameters):
+    results = moduleWithSmallestNumberOfUnknownParameters.search(knownParameters) if profile == None else profile.profileModuleSearch(moduleWithSmallestNumberOfUnknownParameters, knownParameters, len(searchModules))
+    for parameterValues in results:
         # Add the parameter values to the known parameters
         newKnownParameters = knownParameters | parameterValues
         # Recursively search for the remaining modules
-        for newKnownParameters in searchAllSearchModules([searchModule for searchModule in searchModules if searchModule != moduleWithSmallestNumberOfUnknownParameters], newKnownParameters):
+        for newKnownParameters in searchAllSearchModules([searchModule for searchModule in searchModules if searchModule != moduleWithSmallestNumberOfUnknownParameters], newKnownParameters, profile):
             yield newKnownParameters
 
+def estimateNumberOfMatchingTriples(framework, values, knownParameterNames):
+    """
+    Estimates the number of triples that match one combination of known parameter values.
+    values contains for each of the four triple positions eather None, a parameter name or a node.
+    """
+    constantNodes = [value for value in values if value != None and type(value) != str]
+    searchTriples = constantNodes[0]._linkedTriples if len(constantNodes) > 0 else framework._triples
+    matchingTriples = [triple for triple in searchTriples if all([type(value) == str or value == None or triple[i] == value._index for i, value in enumerate(values)])]
+    knownColumns = set([i for i, value in enumerate(values) if type(value) == str and value in knownParameterNames])
+    return estimateNumberOfRows(len(matchingTriples), [len(set([triple[i] for triple in matchingTriples])) for i in knownColumns])
+
 class TripleSearchModule:
     def __init__(self, subj, pred, obj, framework):
         self.subj = subj
@@ -176,18 +417,32 @@ class TripleSearchModule:
         self.obj = obj
         self.framework = framework
         self.parameterNames = ({subj} if type(subj) == str else set()) | ({pred} if type(pred) == str else set()) | ({obj} if type(obj) == str else set())
+        # The results only depend on the own parameters and can be joined with a full scan if no parameter is repeated
+        self.dependencyParameterNames = self.parameterNames
+        self.allowsFullScan = len(self.parameterNames) == len([item for item in (subj, pred, obj) if type(item) == str])
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"TripleSearchModule({self.subj!r}, {self.pred!r}, {self.obj!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        return estimateNumberOfMatchingTriples(self.framework, [self.subj, self.pred, self.obj, None], knownParameterNames)
     def search(self, knownParameters):
         subjValue = knownParameters.get(self.subj, None) if type(self.subj) == str else self.subj
         predValue = knownParameters.get(self.pred, None) if type(self.pred) == str else self.pred
         objValue = knownParameters.get(self.obj, None) if type(self.obj) == str else self.obj
         searchTriples = subjValue._linkedTriples if subjValue != None else predValue._linkedTriples if predValue != None else objValue._linkedTriples if objValue != None else self.framework._triples
+        self.lastNumberOfScannedRows = len(searchTriples)
         matchingTriples = [triple for triple in searchTriples if (subjValue == None or triple[0] == subjValue._index) and (predValue == None or triple[1] == predValue._index) and (objValue == None or triple[2] == objValue._index)]
         for matchingTriple in matchingTriples:
             yield {**({self.subj : self.framework._nodesByIndex[matchingTriple[0]]} if type(self.subj) == str else {}),
                    **({self.pred : self.framework._nodesByIndex[matchingTriple[1]]} if type(self.pred) == str else {}),
                    **({self.obj : self.framework._nodesByIndex[matchingTriple[2]]} if type(self.obj) == str else {})}
+    def getParameterValuesOfChange(self, event):
+        """
+        Returns the parameter values of the results that the created or deleted node of the change event can add or remove.
+        """
+        return [parameterValues for parameterValues in [getParameterValuesOfMatch((self.subj, self.pred, self.obj), triple) for triple in event.get("triples", [])] if parameterValues != None]
 class ConstructedSearchModule:
     def __init__(self, param, baseConnections, connectionIndex, exactNumberOfBaseConnections, framework):
         self.framework = framework
@@ -202,14 +457,23 @@ class ConstructedSearchModule:
         self.pred = self.pred if self.pred != 0 else param
         self.obj = self.obj if self.obj != 0 else param
         self.parameterNames = ({param} if type(param) == str else set()) | ({self.subj} if type(self.subj) == str else set()) | ({self.pred} if type(self.pred) == str else set()) | ({self.obj} if type(self.obj) == str else set())
+        # The results also depend on the parameters of the other base connections, because their triples can not be matched again
+        self.dependencyParameterNames = self.parameterNames | set([item for baseConnection in baseConnections for item in baseConnection if type(item) == str])
+        self.allowsFullScan = len(baseConnections) == 1 and len(self.parameterNames) == (type(param) == str) + len([item for item in baseConnections[connectionIndex] if type(item) == str])
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"ConstructedSearchModule({self.param!r}, {self.subj!r}, {self.pred!r}, {self.obj!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        return estimateNumberOfMatchingTriples(self.framework, [self.subj, self.pred, self.obj, self.param], knownParameterNames)
     def search(self, knownParameters):
         subjValue = knownParameters.get(self.subj, None) if type(self.subj) == str else self.subj
         predValue = knownParameters.get(self.pred, None) if type(self.pred) == str else self.pred
         objValue = knownParameters.get(self.obj, None) if type(self.obj) == str else self.obj
         ownerValue = knownParameters.get(self.param, None) if type(self.param) == str else self.param
         searchTriples = ownerValue._linkedTriples if ownerValue != None else subjValue._linkedTriples if subjValue != None else predValue._linkedTriples if predValue != None else objValue._linkedTriples if objValue != None else self.framework._triples
+        self.lastNumberOfScannedRows = len(searchTriples)
         matchingTriples = [
             [self.framework._nodesByIndex[triple[0]], self.framework._nodesByIndex[triple[1]], self.framework._nodesByIndex[triple[2]], self.framework._nodesByIndex[triple[3]]]
             for triple in searchTriples if (subjValue == None or triple[0] == subjValue._index) and (predValue == None or triple[1] == predValue._index) and (objValue == None or triple[2] == objValue._index) and (ownerValue == None or triple[3] == ownerValue._index)]
@@ -237,22 +501,64 @@ class ConstructedSearchModule:
                    **({self.pred : matchingTriple[1]} if type(self.pred) == str else {}),
                    **({self.obj : matchingTriple[2]} if type(self.obj) == str else {}),
                    **({self.param : matchingTriple[3]} if type(self.param) == str else {})}
+    def getParameterValuesOfChange(self, event):
+        # The number of base connections is not checked again for a known owner
+        if self.exactNumberOfBaseConnections and len(event.get("triples", [])) != len(self.baseConnections):
+            return []
+        return [parameterValues for parameterValues in [getParameterValuesOfMatch((self.subj, self.pred, self.obj, self.param), (*triple, event["key"])) for triple in event.get("triples", [])] if parameterValues != None]
 class DataSearchModule:
     def __init__(self, param, data, format, framework):
         self.framework = framework
         self.param = param
         self.data = data
         self.format = format
-        self.parameterNames = ({param} if type(param) == str else set()) | ({data[0]} if type(data) == list else set()) | ({format[0]} if type(format) == list else set())
+        # The data can also be a prefix, substring or full text match (see data_text_search)
+        self.dataMatch = getDataMatch(data) if type(data) == dict else None
+        self.dataParameterName = data[0] if type(data) == list else data.get("parameter", None) if type(data) == dict else None
+        self.parameterNames = ({param} if type(param) == str else set()) | ({self.dataParameterName} if self.dataParameterName != None else set()) | ({format[0]} if type(format) == list else set())
+        self.dependencyParameterNames = self.parameterNames
+        self.allowsFullScan = len(self.parameterNames) == (type(param) == str) + (self.dataParameterName != None) + (type(format) == list)
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"DataSearchModule({self.param!r}, {self.data!r}, {self.format!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        if self.dataMatch == None:
+            candidateNodes = self.framework._nodes.values()
+        else:
+            dataTextIndex = self.framework._getDataTextIndex()
+            candidateNodes = [node for data in dataTextIndex.findData(self.dataMatch) for node in dataTextIndex.getNodes(data)]
+        matchingNodes = [node for node in candidateNodes if node._isDataNode and (type(self.param) == str or node == self.param) and (type(self.data) != str or node.data == self.data) and (type(self.format) == list or node.format == self.format)]
+        return estimateNumberOfRows(len(matchingNodes), [
+            *([len(matchingNodes)] if type(self.param) == str and self.param in knownParameterNames else []),
+            *([len(set([node.data for node in matchingNodes]))] if self.dataParameterName != None and self.dataParameterName in knownParameterNames else []),
+            *([len(set([node.format for node in matchingNodes]))] if type(self.format) == list and self.format[0] in knownParameterNames else [])])
     def search(self, knownParameters):
         paramValue = knownParameters.get(self.param, None) if type(self.param) == str else self.param
-        dataValue = knownParameters.get(self.data[0], None) if type(self.data) == list else self.data
+        dataValue = knownParameters.get(self.dataParameterName, None) if self.dataParameterName != None else self.data if type(self.data) == str else None
         formatValue = knownParameters.get(self.format[0], None) if type(self.format) == list else self.format
-        matchingAbstractions = [(node, node.data, node.format) for node in self.framework._nodes.values() if node._isDataNode and (paramValue == None or node == paramValue) and (dataValue == None or node.data == dataValue) and (formatValue == None or node.format == formatValue)]
+        # Use the per format index or the text index of the data nodes if possible
+        if paramValue != None:
+            candidateNodes = [paramValue]
+        elif formatValue != None and (dataValue != None or self.dataMatch == None):
+            nodesByData = self.framework._dataNodesByFormat.get(formatValue, {})
+            candidateNodes = [*nodesByData.values()] if dataValue == None else [nodesByData[dataValue]] if dataValue in nodesByData else []
+        elif self.dataMatch != None and dataValue == None:
+            dataTextIndex = self.framework._getDataTextIndex()
+            candidateNodes = [node for data in dataTextIndex.findData(self.dataMatch) for node in dataTextIndex.getNodes(data)]
+        else:
+            candidateNodes = [*self.framework._nodes.values()]
+        self.lastNumberOfScannedRows = len(candidateNodes)
+        matchingAbstractions = [(node, node.data, node.format) for node in candidateNodes if node._isDataNode and (paramValue == None or node == paramValue) and (dataValue == None or node.data == dataValue) and (formatValue == None or node.format == formatValue) and (self.dataMatch == None or matchesData(self.dataMatch, node.data))]
         for matchingAbstraction in matchingAbstractions:
             yield {**({self.param : matchingAbstraction[0]} if type(self.param) == str else {}),
-                   **({self.data[0] : matchingAbstraction[1]} if type(self.data) == list else {}),
+                   **({self.dataParameterName : matchingAbstraction[1]} if self.dataParameterName != None else {}),
                    **({self.format[0] : matchingAbstraction[2]} if type(self.format) == list else {})}
+    def getParameterValuesOfChange(self, event):
+        if event.get("data") == None or (type(self.data) == str and self.data != event["data"]) or (type(self.format) == str and self.format != event["format"]) or (self.dataMatch != None and not matchesData(self.dataMatch, event["data"])):
+            return []
+        valueParameters = [(parameter, value) for parameter, value in ((self.dataParameterName, event["data"]), (self.format[0] if type(self.format) == list else None, event["format"])) if parameter != None]
+        parameterValues = getParameterValuesOfMatch([self.param, *[parameter for parameter, value in valueParameters]], [event["key"], *[value for parameter, value in valueParameters]])
+        return [] if parameterValues == None else [parameterValues]
 
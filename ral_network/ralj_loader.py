@@ -11,6 +11,9 @@ def loadRALJFile(file_path, RALFramework):
 
 def loadRALJData(data, RALFramework):
     assert type(data) == list and len(data) < 5
+    if hasattr(RALFramework, "importRALJData"):
+        # The framework imports all blocks at once
+        return RALFramework.importRALJData(data, [jsonNodeID for dataConcepts in (data[0] if len(data) > 0 else {}).values() for jsonNodeID in dataConcepts.values()] + [jsonNodeID for block in data[1:] for jsonNodeID in block])
     dataConceptBlock = data[0] if len(data) > 0 else {}
     constructedConceptBlock = data[1] if len(data) > 1 else {}
     directAbstractionBlock = data[2] if len(data) > 2 else {}
@@ -81,7 +84,23 @@ def saveRALJFile(abstractions, file_path, RALFramework):
         data = saveRALJData(abstractions, RALFramework)
         json.dump(data, file)
 
+def saveRALJDeltaFile(since, file_path, RALFramework):
+    """
+    Writes the changes of the RALFramework after the checkpoint since as a delta file and returns the checkpoint of the delta.
+    """
+    delta = RALFramework.exportRALJDelta(since)
+    with open(file_path, "w") as file:
+        json.dump(delta, file)
+    return delta["checkpoint"]
+
+def loadRALJDeltaFile(file_path, RALFramework):
+    with open(file_path, "r") as file:
+        delta = json.load(file)
+    return RALFramework.importRALJDelta(delta)
+
 def saveRALJData(abstractions, RALFramework):
+    if hasattr(RALFramework, "closure"):
+        return saveRALJDataInDependencyOrder(RALFramework.closure(abstractions))
     jsonNodeIDByAbstractionID = {}
     relatingAbstractionsByAbstractionID = {}
     uncheckedAbstractions = set(abstractions)
@@ -166,4 +185,20 @@ def saveRALJData(abstractions, RALFramework):
                 if not relatingAbstraction in savedAbstractions:
                     uncheckedAbstractions.add(relatingAbstraction)
             del relatingAbstractionsByAbstractionID[abstraction]
-    return [dataConceptBlock, constructedConceptBlock, *([directAbstractionBlock, inverseDirectAbstractionBlock] if len(directAbstractionBlock) > 0 or len(inverseDirectAbstractionBlock) > 0 else [])]
\ No newline at end of file
+    return [dataConceptBlock, constructedConceptBlock, *([directAbstractionBlock, inverseDirectAbstractionBlock] if len(directAbstractionBlock) > 0 or len(inverseDirectAbstractionBlock) > 0 else [])]
+
+def saveRALJDataInDependencyOrder(abstractions):
+    """
+    Saves the abstractions, that have to be ordered such that every abstraction comes after the abstractions in its base connections.
+    """
+    jsonNodeIDByAbstraction = {}
+    dataConceptBlock = {}
+    constructedConceptBlock = {}
+    for jsonNodeIndex, abstraction in enumerate(abstractions, 1):
+        jsonNodeName = jsonNodeIDByAbstraction[abstraction] = str(jsonNodeIndex)
+        if abstraction.type == "data":
+            data, format = abstraction.content
+            dataConceptBlock.setdefault(format, {})[data] = jsonNodeName
+        else:
+            constructedConceptBlock[jsonNodeName] = [[0 if y == 0 else jsonNodeIDByAbstraction[y] for y in x] for x in abstraction.connections]
+    return [dataConceptBlock, constructedConceptBlock]
@@ -0,0 +1,121 @@
+# Instrumentation of the RAL frameworks and their pattern searches.
+# FrameworkCounters count framework wide events like sql statements, commits, wrapper creations and deletion cascades.
+# SearchProfile records how the search modules of a single search performed.
+# explainSearchModules shows the order in which searchAllSearchModules is going to use the search modules.
+
+from time import perf_counter
+
+class FrameworkCounters:
+    """
+    Framework wide event counters.
+    Every callable in onIncrement is called with the counter name and the amount whenever a counter is incremented.
+    """
+    def __init__(self):
+        self._counts = {}
+        self._onIncrement = set()
+    def increment(self, name, amount = 1):
+        self._counts[name] = self._counts.get(name, 0) + amount
+        for hook in self._onIncrement:
+            hook(name, amount)
+    @property
+    def onIncrement(self):
+        return self._onIncrement
+    def get(self, name):
+        return self._counts.get(name, 0)
+    def asDict(self):
+        return dict(self._counts)
+    def reset(self):
+        self._counts = {}
+
+class SearchProfile:
+    """
+    Records per search module the number of search calls, the number of scanned and yielded rows and the time spent inside the module.
+    Every callable in onModuleSearch is called with the search module, the number of scanned rows, the number of yielded rows and the duration in seconds after each search call of a module.
+    """
+    def __init__(self):
+        self._statisticsByModule = {}
+        self._onModuleSearch = set()
+    @property
+    def onModuleSearch(self):
+        return self._onModuleSearch
+    def profileModuleSearch(self, searchModule, knownParameters, numberOfRemainingModules):
+        """
+        Wraps the search of the searchModule and records its statistics.
+        """
+        statistics = self._statisticsByModule.setdefault(searchModule, {"module": repr(searchModule), "remainingModules": set(), "calls": 0, "rowsScanned": 0, "rowsYielded": 0, "time": 0.0})
+        statistics["calls"] += 1
+        statistics["remainingModules"].add(numberOfRemainingModules)
+        searchModule.lastNumberOfScannedRows = 0
+        rowsYielded = 0
+        duration = 0.0
+        results = searchModule.search(knownParameters)
+        try:
+            while True:
+                startTime = perf_counter()
+                try:
+                    parameterValues = next(results)
+                except StopIteration:
+                    break
+                finally:
+                    duration += perf_counter() - startTime
+                rowsYielded += 1
+                yield parameterValues
+        finally:
+            statistics["rowsScanned"] += searchModule.lastNumberOfScannedRows
+            statistics["rowsYielded"] += rowsYielded
+            statistics["time"] += duration
+            for hook in self._onModuleSearch:
+                hook(searchModule, searchModule.lastNumberOfScannedRows, rowsYielded, duration)
+    @property
+    def statistics(self):
+        """
+        Returns a list with the statistics of every used search module ordered by the level at which the module was chosen.
+        """
+        maximalNumberOfRemainingModules = max([max(statistics["remainingModules"]) for statistics in self._statisticsByModule.values()], default = 0)
+        result = []
+        for statistics in self._statisticsByModule.values():
+            statistics = dict(statistics)
+            statistics["levels"] = sorted([maximalNumberOfRemainingModules - numberOfRemainingModules for numberOfRemainingModules in statistics.pop("remainingModules")])
+            result.append(statistics)
+        result.sort(key = lambda statistics: statistics["levels"])
+        return result
+
+def explainSearchModules(searchModules, knownParameters):
+    """
+    Returns the steps that searchAllSearchModules takes for the given search modules.
+    Each step contains the chosen module, the parameters known before and introduced by the module, the estimated number of rows per known parameter combination and the estimated number of result rows after the step.
+    """
+    knownParameterNames = set(knownParameters)
+    remainingSearchModules = list(searchModules)
+    steps = []
+    estimatedResultRows = 1
+    while len(remainingSearchModules) > 0:
+        # Choose the module the same way searchAllSearchModules does
+        smallestUndefinednessIndex = None
+        chosenSearchModule = None
+        for searchModule in remainingSearchModules:
+            undefinednessIndex = searchModule.getUndefinednessIndex(knownParameterNames)
+            if smallestUndefinednessIndex == None or undefinednessIndex < smallestUndefinednessIndex:
+                smallestUndefinednessIndex = undefinednessIndex
+                chosenSearchModule = searchModule
+        estimatedRows = chosenSearchModule.estimateNumberOfRows(knownParameterNames)
+        estimatedResultRows *= estimatedRows
+        steps.append({
+            "level": len(steps),
+            "module": repr(chosenSearchModule),
+            "knownParameters": sorted(chosenSearchModule.parameterNames & knownParameterNames),
+            "newParameters": sorted(chosenSearchModule.parameterNames - knownParameterNames),
+            "estimatedRows": estimatedRows,
+            "estimatedResultRows": estimatedResultRows})
+        knownParameterNames |= chosenSearchModule.parameterNames
+        remainingSearchModules.remove(chosenSearchModule)
+    return steps
+
+def estimateNumberOfRows(numberOfRows, numberOfDistinctValuesOfKnownColumns):
+    """
+    Estimates the number of rows that match one combination of known column values assuming uniformly distributed values.
+    """
+    estimate = float(numberOfRows)
+    for numberOfDistinctValues in numberOfDistinctValuesOfKnownColumns:
+        estimate /= max(numberOfDistinctValues, 1)
+    return estimate
@@ -0,0 +1,539 @@
+# A RAL framework that partitions its abstractions across several local sqlite files.
+# Every abstraction is stored in the shard selected by its structural hash and every triple is stored in the shard of its owner.
+# The id of an abstraction encodes its shard: id = localId * numberOfShards + shardIndex.
+# Searches with parallel=True fan out per shard on worker processes: each worker only scans the rows of its shard for the first search module
+# and resolves all remaining search modules against all shards, so the union of the worker results is the complete result.
+# The workers are started with the "spawn" method, so they do not inherit the open sqlite connections of the parent process.
+# Scripts that use parallel searches therefore need an if __name__ == "__main__" guard.
+# The workers send their results in chunks over a queue, so that the results of a search are streamed while the workers are still searching.
+
+import sqlite3
+import os
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from weakref import WeakValueDictionary
+from .structural_hash import dataAbstractionHash, constructedAbstractionHash
+from .search_instrumentation import FrameworkCounters
+from .ral_framework import searchAllSearchModules
+from .sqlite_ral_framework import _InstrumentedConnection, _InstrumentedCursor, createNodeFromArguments, getAbstractionWrapper, deactivateAbstractionWrapper, parseConnectionRepresentation, deleteAbstractionSafely, forceAbstractionDeletionCascade
+
+# The maximal number of results that a worker sends at once
+shardResultChunkSize = 1000
+# The number of seconds after which a search waiting for results checks if a worker died
+shardResultPollInterval = 0.5
+
+class ShardedRALFramework:
+    def __init__(self, db_paths, numberOfWorkers = None, chunkSize = None):
+        """
+        Opens the sqlite files in db_paths as the shards of the framework. The files have to be given in the same order every time.
+        numberOfWorkers is the number of worker processes used by parallel searches (by default one per shard, limited by the number of cpus).
+        chunkSize is the maximal number of results that a worker sends at once (shardResultChunkSize by default).
+        """
+        self._db_paths = [str(db_path) for db_path in db_paths]
+        if len(self._db_paths) == 0:
+            raise ValueError("At least one shard is required.")
+        self._numberOfShards = len(self._db_paths)
+        self._counters = FrameworkCounters()
+        self._connections = []
+        self._cursors = []
+        for db_path in self._db_paths:
+            connection = sqlite3.connect(db_path, factory = _InstrumentedConnection)
+            connection._counters = self._counters
+            cursor = connection.cursor(factory = _InstrumentedCursor)
+            cursor._counters = self._counters
+            ensureShardSchema(cursor)
+            connection.commit()
+            self._connections.append(connection)
+            self._cursors.append(cursor)
+        self._numberOfWorkers = numberOfWorkers if numberOfWorkers != None else min(self._numberOfShards, os.cpu_count() or 1)
+        self._chunkSize = chunkSize if chunkSize != None else shardResultChunkSize
+        self._executor = None
+        self._manager = None
+        self._wrappersByAbstractionID = WeakValueDictionary()
+        self._onClose = set()
+    def Node(self, *args):
+        """
+            Creates eather a data node or a constructed node depending on the arguments.
+            (data: string, format: string): Creates a data node with the given data and format.
+            (data: string): Creates a data node with the given data and the "text" format.
+            (baseConnections: list): Creates a constructed node with the given base connections.
+        """
+        return createNodeFromArguments(self, args)
+    def ConstructedAbstraction(self, baseConnections):
+        # Iterate through the base connections and create the triple representations
+        tripleHashes = []
+        for triple in baseConnections:
+            if not 0 in triple or len(triple) != 3:
+                raise ValueError("The base connections must consist of triples with at least one element being 0.")
+            for element in triple:
+                if element != 0 and not self.isValidAbstraction(element):
+                    raise ValueError("The elements of a triple must be abstractions.")
+            tripleHashes.append([0 if element == 0 else element.hash for element in triple])
+        hash = constructedAbstractionHash(tripleHashes)
+        id = self._findAbstractionIDByHash(hash)
+        if id != None:
+            return self._getAbstractionWrapperFromID(id)
+        return self._getAbstractionWrapperFromID(self._insertAbstraction(hash, None, None, [[0 if element == 0 else element.id for element in triple] for triple in baseConnections]))
+    def DirectDataAbstraction(self, datastring, formatstring):
+        hash = dataAbstractionHash(datastring, formatstring)
+        id = self._findAbstractionIDByHash(hash)
+        if id != None:
+            return self._getAbstractionWrapperFromID(id)
+        return self._getAbstractionWrapperFromID(self._insertAbstraction(hash, datastring, formatstring, None))
+    def _shardIndexOfHash(self, hash):
+        return int(hash[:16], 16) % self._numberOfShards
+    def _findAbstractionIDByHash(self, hash):
+        shardIndex = self._shardIndexOfHash(hash)
+        res = self._cursors[shardIndex].execute("SELECT id FROM abstractions WHERE hash = ?", (hash,)).fetchone()
+        return None if res == None else res[0] * self._numberOfShards + shardIndex
+    def _insertAbstraction(self, hash, data, format, connectionIds):
+        """
+        Inserts the abstraction into the shard of its hash and its triples with global ids and returns the global id of the new abstraction.
+        """
+        shardIndex = self._shardIndexOfHash(hash)
+        cursor = self._cursors[shardIndex]
+        if connectionIds == None:
+            cursor.execute("INSERT INTO abstractions (data, format, connections, remember, hash) VALUES (?, ?, ?, ?, ?)", (data, format, None, 0, hash))
+            id = cursor.lastrowid * self._numberOfShards + shardIndex
+        else:
+            connectionRepresentationString = "|".join(sorted([",".join(["-" if element == 0 else str(element) for element in triple]) for triple in connectionIds]))
+            cursor.execute("INSERT INTO abstractions (data, format, connections, remember, hash) VALUES (?, ?, ?, ?, ?)", (None, None, connectionRepresentationString, 0, hash))
+            id = cursor.lastrowid * self._numberOfShards + shardIndex
+            cursor.executemany("INSERT INTO triples (subject, predicate, object, owner) VALUES (?, ?, ?, ?)", [tuple([id if element == 0 else element for element in triple]) + (id,) for triple in connectionIds])
+        self._connections[shardIndex].commit()
+        return id
+    def _getAbstractionWrapperFromID(self, id):
+        return getAbstractionWrapper(id, self, ShardedAbstraction)
+    def _shardOfID(self, id):
+        """
+        Returns the cursor of the shard of the abstraction id and the local id of the abstraction in the shard.
+        """
+        return self._cursors[id % self._numberOfShards], id // self._numberOfShards
+    def __del__(self):
+        self.close()
+    def close(self):
+        if self._connections == None:
+            return
+        for closefunction in self._onClose:
+            closefunction(self)
+        for wrapper in self._wrappersByAbstractionID.values():
+            wrapper._safeDelete()
+        if self._executor != None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._manager != None:
+            self._manager.shutdown()
+            self._manager = None
+        for connection in self._connections:
+            connection.close()
+        self._connections = None
+    @property
+    def onClose(self):
+        return self._onClose
+    @property
+    def counters(self):
+        """
+        The framework wide counters "sqlStatements", "commits", "wrapperCreations", "deletedAbstractions" and "cascadedDeletions" of all shards.
+        """
+        return self._counters
+    @property
+    def numberOfShards(self):
+        return self._numberOfShards
+    def isValidAbstraction(self, abstraction):
+        return type(abstraction) == ShardedAbstraction and abstraction.RALFramework == self and abstraction._id != None
+    def getAbstractionFromHash(self, hash):
+        """
+        Returns the abstraction with the given structural hash or None if there is no such abstraction.
+        """
+        id = self._findAbstractionIDByHash(hash)
+        return None if id == None else self._getAbstractionWrapperFromID(id)
+    def search(self, triples = [], data = {}, constructed = {}, parallel = False):
+        return self.searchRALJPattern(data, constructed, triples, parallel)
+    def searchRALJPattern(self, data = {}, constructed = {}, triples = [], parallel = False):
+        """
+        Yields all parameter combinations that match the pattern.
+        If parallel is True and there are worker processes, the search fans out per shard on the worker processes and the results are merged.
+        Starting the workers takes much longer than a small search, so only large searches should be run in parallel.
+        """
+        # Replace the abstractions in the pattern by their ids, so that the pattern can be sent to the worker processes
+        dataBlock = {}
+        knownParameters = {}
+        for dataParam, (dataValue, formatValue) in data.items():
+            if type(dataValue) == str and type(formatValue) == str:
+                knownParameters[dataParam] = self.DirectDataAbstraction(dataValue, formatValue).id
+            else:
+                dataBlock[dataParam] = (dataValue, formatValue)
+        toPatternValue = lambda value: value.id if type(value) == ShardedAbstraction else value
+        constructedBlock = {toPatternValue(param) : [baseConnection if baseConnection == "+" else [toPatternValue(item) for item in baseConnection] for baseConnection in baseConnections] for param, baseConnections in constructed.items()}
+        tripleBlock = [[toPatternValue(item) for item in triple] for triple in triples]
+        pattern = (dataBlock, constructedBlock, tripleBlock)
+        if parallel and self._numberOfWorkers > 0 and self._numberOfShards > 1:
+            results = self._searchShardsInParallel(pattern, knownParameters)
+        else:
+            results = searchAllSearchModules(createShardedSearchModules(pattern, self), knownParameters)
+        for knownParameters in results:
+            # Replace all id parameters with the corresponding abstractions
+            yield {key : (self._getAbstractionWrapperFromID(value) if type(value) == int else value) for key, value in knownParameters.items()}
+    def _searchShardsInParallel(self, pattern, knownParameters):
+        """
+        Yields the results of the workers of all shards in the order in which their chunks arrive.
+        """
+        if self._executor == None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(self._numberOfWorkers, mp_context = context)
+            self._manager = context.Manager()
+        # The bounded queue stops the workers while the consumer of the search does not take any results
+        resultQueue = self._manager.Queue(2 * self._numberOfWorkers)
+        stopEvent = self._manager.Event()
+        futures = [self._executor.submit(searchShard, self._db_paths, pattern, knownParameters, shardIndex, resultQueue, stopEvent, self._chunkSize) for shardIndex in range(self._numberOfShards)]
+        numberOfRunningShards = self._numberOfShards
+        try:
+            while numberOfRunningShards > 0:
+                chunk = self._getChunk(resultQueue, futures)
+                # None marks the end of the results of a shard
+                if chunk == None:
+                    numberOfRunningShards -= 1
+                    continue
+                yield from chunk
+            for future in futures:
+                future.result()
+        finally:
+            # Stop the workers of an abandoned search and wait until they release the queue. The futures of dead workers are done as well.
+            if numberOfRunningShards > 0:
+                stopEvent.set()
+                while numberOfRunningShards > 0 and not all([future.done() for future in futures]):
+                    try:
+                        if resultQueue.get(timeout = shardResultPollInterval) == None:
+                            numberOfRunningShards -= 1
+                    except queue.Empty:
+                        pass
+    def _getChunk(self, resultQueue, futures):
+        """
+        Returns the next chunk of results of the workers. Raises the error of a worker that failed while no chunk arrives, so that a killed worker does not block the search forever.
+        """
+        while True:
+            try:
+                return resultQueue.get(timeout = shardResultPollInterval)
+            except queue.Empty:
+                for future in futures:
+                    if future.done() and future.exception() != None:
+                        # A killed worker breaks the pool, so the next parallel search starts a new one
+                        if isinstance(future.exception(), BrokenProcessPool):
+                            self._executor.shutdown(wait = False)
+                            self._executor = None
+                        raise future.exception()
+    def getStringRepresentationFromAbstraction(self, abstraction):
+        if type(abstraction) != ShardedAbstraction:
+            raise ValueError("The abstraction must be a ShardedAbstraction.")
+        return str(abstraction.id)
+    def getAbstractionFromStringRepresentation(self, stringRepresentation):
+        cursor, localId = self._shardOfID(int(stringRepresentation))
+        if cursor.execute("SELECT id FROM abstractions WHERE id = ?", (localId,)).fetchone() == None:
+            raise ValueError("The abstraction with the given id does not exist.")
+        return self._getAbstractionWrapperFromID(int(stringRepresentation))
+    def getAllNodes(self):
+        return [self._getAbstractionWrapperFromID(localId * self._numberOfShards + shardIndex) for shardIndex, cursor in enumerate(self._cursors) for localId, in cursor.execute("SELECT id FROM abstractions").fetchall()]
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    def clearAllNodes(self):
+        for node in self.getAllNodes():
+            node.forceDeletion()
+
+class ShardedAbstraction:
+    def __init__(self, abstractionId, framework):
+        self._id = abstractionId
+        self._hash = None
+        self.RALFramework = framework
+    def _query(self, columns):
+        cursor, localId = self.RALFramework._shardOfID(self.id)
+        return cursor.execute("SELECT " + columns + " FROM abstractions WHERE id = ?", (localId,)).fetchone()
+    @property
+    def framework(self):
+        return self.RALFramework
+    @property
+    def id(self):
+        if self._id == None:
+            raise ValueError("The abstraction has been deleted.")
+        return self._id
+    @property
+    def shardIndex(self):
+        return self.id % self.RALFramework._numberOfShards
+    @property
+    def hash(self):
+        # The structural hash never changes, so it is only queried once
+        if self._hash == None:
+            self._hash = self._query("hash")[0]
+        return self._hash
+    @property
+    def data(self):
+        return self._query("data")[0]
+    @property
+    def format(self):
+        return self._query("format")[0]
+    @property
+    def content(self):
+        data, format, connections = self._query("data, format, connections")
+        if data != None:
+            return (data, format)
+        return parseConnectionRepresentation(connections, self.RALFramework)
+    @property
+    def connections(self):
+        return parseConnectionRepresentation(self._query("connections")[0], self.RALFramework)
+    @property
+    def remembered(self):
+        return self._query("remember")[0] != 0
+    @remembered.setter
+    def remembered(self, value):
+        cursor, localId = self.RALFramework._shardOfID(self.id)
+        cursor.execute("UPDATE abstractions SET remember = ? WHERE id = ?", (1 if value else 0, localId))
+        cursor.connection.commit()
+    @property
+    def type(self):
+        return "data" if self._query("data")[0] != None else "constructed"
+    def __repr__(self):
+        if self._id == None:
+            return f"Abstraction(deleted)"
+        return f"Abstraction({self.id})"
+    def __del__(self):
+        self._safeDelete()
+    @property
+    def isDeleted(self):
+        return self._id == None
+    def _safeDelete(self):
+        if self._id == None:
+            return
+        id = self.id
+        self._id = None
+        # Check if the abstraction can be savely deleted from the shards
+        deleteAbstractionSafely(id, self.RALFramework, checkForSafeShardedAbstractionDeletion)
+    def forceDeletion(self):
+        if self._id == None:
+            return
+        forceAbstractionDeletionCascade(self._id, self.RALFramework, forceShardedAbstractionDeletion, checkForSafeShardedAbstractionDeletion)
+
+def ensureShardSchema(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS abstractions (id INTEGER PRIMARY KEY, data TEXT, format TEXT, connections TEXT, remember INTEGER, hash TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS triples (id INTEGER PRIMARY KEY, subject INTEGER, predicate INTEGER, object INTEGER, owner INTEGER)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS abstractionsByHash ON abstractions (hash)")
+    for column in ["owner", "subject", "predicate", "object"]:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS triplesBy{column.capitalize()} ON triples ({column})")
+
+def checkForSafeShardedAbstractionDeletion(id, RALFramework):
+    """
+    Checks if the abstraction with the given id can be savely deleted from its shard.
+    Returns a set of the abstraction ids that should also be checked for safe deletion.
+    """
+    cursor, localId = RALFramework._shardOfID(id)
+    # Check if the abstraction still exists and is not remembered
+    res = cursor.execute("SELECT remember FROM abstractions WHERE id = ?", (localId,)).fetchone()
+    if res == None or res[0] != 0:
+        return set()
+    # Check if tere is a active wrapper for the abstraction
+    wrapper = RALFramework._wrappersByAbstractionID.get(id)
+    if wrapper != None and wrapper._id != None:
+        return set()
+    # Check if the abstraction is only used by its own triples, which are all stored in its own shard
+    for shardCursor in RALFramework._cursors:
+        if shardCursor.execute("SELECT 1 FROM triples WHERE (subject = ? OR predicate = ? OR object = ?) AND owner != ? LIMIT 1", (id, id, id, id)).fetchone() != None:
+            return set()
+    triples = cursor.execute("SELECT subject, predicate, object FROM triples WHERE owner = ?", (id,)).fetchall()
+    connectedAbstractions = set([element for triple in triples for element in triple if element != id])
+    # Delete the triples and the abstraction
+    cursor.execute("DELETE FROM triples WHERE owner = ?", (id,))
+    cursor.execute("DELETE FROM abstractions WHERE id = ?", (localId,))
+    cursor.connection.commit()
+    RALFramework._counters.increment("deletedAbstractions")
+    return connectedAbstractions
+
+def forceShardedAbstractionDeletion(id, RALFramework):
+    """
+    Forces the deletion of the abstraction with the given id.
+    returns the set of the abstraction ids that also have to be forced to be deleted.
+    """
+    cursor, localId = RALFramework._shardOfID(id)
+    # Unset the remembered flag
+    cursor.execute("UPDATE abstractions SET remember = 0 WHERE id = ?", (localId,))
+    deactivateAbstractionWrapper(id, RALFramework)
+    # The owners of all triples that use the abstraction have to be deleted as well
+    forcedDeletionIds = set()
+    for shardCursor in RALFramework._cursors:
+        forcedDeletionIds |= set([row[0] for row in shardCursor.execute("SELECT owner FROM triples WHERE subject = ? OR predicate = ? OR object = ?", (id, id, id)).fetchall()])
+    return forcedDeletionIds
+
+class _ShardConnections:
+    """
+    The shard cursors of a worker process. Provides what the sharded search modules need from a framework.
+    """
+    def __init__(self, db_paths):
+        self._numberOfShards = len(db_paths)
+        self._connections = [sqlite3.connect(db_path) for db_path in db_paths]
+        self._cursors = [connection.cursor() for connection in self._connections]
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+
+def searchShard(db_paths, pattern, knownParameters, shardIndex, resultQueue, stopEvent, chunkSize):
+    """
+    Runs in a worker process. Puts all parameter combinations of the pattern whose rows of the first search module are stored in the given shard
+    in chunks of at most chunkSize results into the result queue and finally puts None into it, even if the search fails.
+    The search ends early when the stop event is set.
+    """
+    results = searchShardResults(db_paths, pattern, knownParameters, shardIndex)
+    try:
+        chunk = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) >= chunkSize:
+                resultQueue.put(chunk)
+                chunk = []
+                if stopEvent.is_set():
+                    return
+        if len(chunk) > 0:
+            resultQueue.put(chunk)
+    finally:
+        results.close()
+        resultQueue.put(None)
+
+def searchShardResults(db_paths, pattern, knownParameters, shardIndex):
+    """
+    Yields all parameter combinations of the pattern whose rows of the first search module are stored in the given shard.
+    """
+    # The connections only live as long as the search, so that the worker processes do not keep the shard files open
+    shardConnections = _ShardConnections(db_paths)
+    try:
+        searchModules = createShardedSearchModules(pattern, shardConnections)
+        if len(searchModules) == 0:
+            if shardIndex == 0:
+                yield knownParameters
+            return
+        # Restrict the module that searchAllSearchModules chooses first to the shard
+        smallestUndefinednessIndex = None
+        firstSearchModule = None
+        for searchModule in searchModules:
+            undefinednessIndex = searchModule.getUndefinednessIndex(knownParameters)
+            if smallestUndefinednessIndex == None or undefinednessIndex < smallestUndefinednessIndex:
+                smallestUndefinednessIndex = undefinednessIndex
+                firstSearchModule = searchModule
+        firstSearchModule.shardIndices = [shardIndex]
+        yield from searchAllSearchModules(searchModules, knownParameters)
+    finally:
+        shardConnections.close()
+
+def createShardedSearchModules(pattern, framework):
+    dataBlock, constructedBlock, tripleBlock = pattern
+    searchModules = []
+    for dataParam, (data, format) in dataBlock.items():
+        searchModules.append(ShardedDataSearchModule(dataParam, data, format, framework))
+    for constructedParam, baseConnections in constructedBlock.items():
+        exactNumberOfBaseConnections = True
+        if len(baseConnections) > 0 and baseConnections[-1] == "+":
+            baseConnections = baseConnections[:-1]
+            exactNumberOfBaseConnections = False
+        for i in range(len(baseConnections)):
+            searchModules.append(ShardedConstructedSearchModule(constructedParam, baseConnections, i, exactNumberOfBaseConnections, framework))
+    for subj, pred, obj in tripleBlock:
+        searchModules.append(ShardedTripleSearchModule(subj, pred, obj, framework))
+    return searchModules
+
+def queryTriples(framework, shardIndices, valuesByColumn):
+    """
+    Returns the subject, predicate, object and owner of all triples in the shards that have the given column values.
+    """
+    if valuesByColumn.get("owner") != None:
+        # The triples are stored in the shard of their owner
+        shardIndices = [shardIndex for shardIndex in shardIndices if shardIndex == valuesByColumn["owner"] % framework._numberOfShards]
+    conditions = [column + " = ?" for column, value in valuesByColumn.items() if value != None]
+    parameters = tuple([value for value in valuesByColumn.values() if value != None])
+    sql = "SELECT subject, predicate, object, owner FROM triples" + (" WHERE " + " AND ".join(conditions) if len(conditions) > 0 else "")
+    return [row for shardIndex in shardIndices for row in framework._cursors[shardIndex].execute(sql, parameters).fetchall()]
+
+class ShardedDataSearchModule:
+    def __init__(self, param, data, format, framework):
+        self.framework = framework
+        self.param = param
+        self.data = data
+        self.format = format
+        self.shardIndices = range(framework._numberOfShards)
+        self.parameterNames = ({param} if type(param) == str else set()) | ({data[0]} if type(data) == list else set()) | ({format[0]} if type(format) == list else set())
+    def getUndefinednessIndex(self, knownParameters):
+        return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def search(self, knownParameters):
+        numberOfShards = self.framework._numberOfShards
+        paramValue = self.param if type(self.param) == int else knownParameters.get(self.param, None)
+        dataValue = self.data if type(self.data) == str else knownParameters.get(self.data[0], None)
+        formatValue = self.format if type(self.format) == str else knownParameters.get(self.format[0], None)
+        conditions = ["data IS NOT NULL", *(["id = ?"] if paramValue != None else []), *(["data = ?"] if dataValue != None else []), *(["format = ?"] if formatValue != None else [])]
+        parameters = tuple([*([paramValue // numberOfShards] if paramValue != None else []), *([dataValue] if dataValue != None else []), *([formatValue] if formatValue != None else [])])
+        shardIndices = [shardIndex for shardIndex in self.shardIndices if paramValue == None or shardIndex == paramValue % numberOfShards]
+        for shardIndex in shardIndices:
+            for localId, data, format in self.framework._cursors[shardIndex].execute("SELECT id, data, format FROM abstractions WHERE " + " AND ".join(conditions), parameters).fetchall():
+                yield {**({self.param : localId * numberOfShards + shardIndex} if type(self.param) == str else {}),
+                       **({self.data[0] : data} if type(self.data) == list else {}),
+                       **({self.format[0] : format} if type(self.format) == list else {})}
+
+class ShardedConstructedSearchModule:
+    def __init__(self, param, baseConnections, connectionIndex, exactNumberOfBaseConnections, framework):
+        self.framework = framework
+        self.param = param
+        self.baseConnections = baseConnections
+        self.connectionIndex = connectionIndex
+        self.exactNumberOfBaseConnections = exactNumberOfBaseConnections
+        self.subj = baseConnections[connectionIndex][0]
+        self.pred = baseConnections[connectionIndex][1]
+        self.obj = baseConnections[connectionIndex][2]
+        self.subj = self.subj if self.subj != 0 else param
+        self.pred = self.pred if self.pred != 0 else param
+        self.obj = self.obj if self.obj != 0 else param
+        self.shardIndices = range(framework._numberOfShards)
+        self.parameterNames = ({param} if type(param) == str else set()) | ({self.subj} if type(self.subj) == str else set()) | ({self.pred} if type(self.pred) == str else set()) | ({self.obj} if type(self.obj) == str else set())
+    def getUndefinednessIndex(self, knownParameters):
+        return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def search(self, knownParameters):
+        getValue = lambda item: item if type(item) == int else knownParameters.get(item, None)
+        ownerValue = getValue(self.param)
+        matchingTriples = queryTriples(self.framework, self.shardIndices, {"subject": getValue(self.subj), "predicate": getValue(self.pred), "object": getValue(self.obj), "owner": ownerValue})
+        if len(matchingTriples) == 0:
+            return
+        # Create the set of already matched triples
+        alreadyMatchedTriples = set()
+        for i, baseConnection in enumerate(self.baseConnections):
+            if i != self.connectionIndex:
+                values = tuple([getValue(item if item != 0 else self.param) for item in baseConnection])
+                if not None in values:
+                    alreadyMatchedTriples.add(values)
+        # Iterate through the matching triples
+        for matchingTriple in matchingTriples:
+            # If the owner got a new value, check if there is an exact number of base connections
+            if ownerValue == None and self.exactNumberOfBaseConnections:
+                # The triples of the owner are all stored in the shard of the owner
+                cursor = self.framework._cursors[matchingTriple[3] % self.framework._numberOfShards]
+                if cursor.execute("SELECT COUNT(*) FROM triples WHERE owner = ?", (matchingTriple[3],)).fetchone()[0] != len(self.baseConnections):
+                    continue
+            # Check if the triple is already matched
+            if (matchingTriple[0], matchingTriple[1], matchingTriple[2]) in alreadyMatchedTriples:
+                continue
+            yield {**({self.subj : matchingTriple[0]} if type(self.subj) == str else {}),
+                   **({self.pred : matchingTriple[1]} if type(self.pred) == str else {}),
+                   **({self.obj : matchingTriple[2]} if type(self.obj) == str else {}),
+                   **({self.param : matchingTriple[3]} if type(self.param) == str else {})}
+
+class ShardedTripleSearchModule:
+    def __init__(self, subj, pred, obj, framework):
+        self.subj = subj
+        self.pred = pred
+        self.obj = obj
+        self.framework = framework
+        self.shardIndices = range(framework._numberOfShards)
+        self.parameterNames = ({subj} if type(subj) == str else set()) | ({pred} if type(pred) == str else set()) | ({obj} if type(obj) == str else set())
+    def getUndefinednessIndex(self, knownParameters):
+        return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def search(self, knownParameters):
+        getValue = lambda item: item if type(item) == int else knownParameters.get(item, None)
+        for matchingTriple in queryTriples(self.framework, self.shardIndices, {"subject": getValue(self.subj), "predicate": getValue(self.pred), "object": getValue(self.obj)}):
+            yield {**({self.subj : matchingTriple[0]} if type(self.subj) == str else {}),
+                   **({self.pred : matchingTriple[1]} if type(self.pred) == str else {}),
+                   **({self.obj : matchingTriple[2]} if type(self.obj) == str else {})}
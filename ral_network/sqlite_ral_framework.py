@@ -1,15 +1,142 @@
 import sqlite3
+import json
+from pathlib import Path
+from array import array
+from collections import Counter
+from contextlib import contextmanager
 from weakref import WeakValueDictionary
+from .structural_hash import dataAbstractionHash, constructedAbstractionHash
+from .search_instrumentation import FrameworkCounters, explainSearchModules, estimateNumberOfRows
+from .batch_search import searchAllSearchModulesInBatches, importNumpy
+from .materialized_view import MaterializedView
+from .ral_framework import depthFirstPostOrder
+from .data_text_search import getDataMatch, matchesData, getDataMatchConditions
+
+class _InstrumentedConnection(sqlite3.Connection):
+    def commit(self):
+        self._counters.increment("commits")
+        super().commit()
+
+class _InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        self._counters.increment("sqlStatements")
+        return super().execute(*args)
+    def executemany(self, *args):
+        self._counters.increment("sqlStatements")
+        return super().executemany(*args)
+
+sqliteJournalModes = ("delete", "truncate", "persist", "memory", "wal", "off")
+# Stored as the user_version of the database after _ensureSchema checked the schema. It has to be increased with every change of _ensureSchema.
+sqliteSchemaVersion = 1
 
 class SQLiteRALFramework:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, journalMode = None, readOnly = False):
+        """
+        Opens the sqlite database at db_path. If a journalMode like "wal" is given, the database is switched to it.
+        With readOnly the existing database is opened read-only without any schema changes and abstractions are not deleted when their wrappers are dropped.
+        """
         self._db_path = db_path
-        self._conn = sqlite3.connect(db_path)
-        self._cur = self._conn.cursor()
-        self._cur.execute("CREATE TABLE IF NOT EXISTS abstractions (id INTEGER PRIMARY KEY, data TEXT, format TEXT, connections TEXT, tripleIds TEXT, remember INTEGER)")
-        self._cur.execute("CREATE TABLE IF NOT EXISTS triples (id INTEGER PRIMARY KEY, subject INTEGER, predicate INTEGER, object INTEGER, owner INTEGER)")
+        self._readOnly = readOnly
+        self._counters = FrameworkCounters()
+        # sqlite neither creates nor writes a database that is opened with the read-only mode of an uri
+        self._connectionArguments = {"database": Path(db_path).resolve().as_uri() + "?mode=ro", "uri": True} if readOnly else {"database": db_path}
+        self._conn = sqlite3.connect(**self._connectionArguments, factory = _InstrumentedConnection)
+        self._conn._counters = self._counters
+        # A failed write must not leave an implicit transaction open, that would keep the database locked for writers
+        if readOnly:
+            self._conn.isolation_level = None
+        self._cur = self._conn.cursor(factory = _InstrumentedCursor)
+        self._cur._counters = self._counters
+        self._conn.create_function("dataAbstractionHash", 2, dataAbstractionHash, deterministic = True)
+        self._conn.create_function("constructedAbstractionHash", 1, constructedAbstractionHashFromTripleHashes, deterministic = True)
         self._wrappersByAbstractionID = WeakValueDictionary()
         self._onClose = set()
+        self._onChange = set()
+        # Idle read connections for snapshot isolated searches
+        self._snapshotConnections = []
+        self._ensureSchema()
+        if journalMode != None:
+            self.journalMode = journalMode
+    def _ensureSchema(self):
+        # The schema of a database that has been checked by this version is only inspected
+        schemaVersion = self._cur.execute("PRAGMA user_version").fetchall()[0][0]
+        if self._readOnly or schemaVersion == sqliteSchemaVersion:
+            tables = set([row[0] for row in self._cur.execute("SELECT name FROM sqlite_master WHERE name IN ('abstractions', 'abstractionDataTrigrams', 'abstractionDataWords')").fetchall()])
+            if "abstractions" not in tables or (schemaVersion != sqliteSchemaVersion and "hash" not in [column[1] for column in self._cur.execute("PRAGMA table_info(abstractions)").fetchall()]):
+                raise ValueError("The schema of the database is missing or outdated, so the database has to be opened writable once.")
+            self._hasFullTextTables = "abstractionDataTrigrams" in tables and "abstractionDataWords" in tables
+            return
+        self._cur.execute("CREATE TABLE IF NOT EXISTS abstractions (id INTEGER PRIMARY KEY, data TEXT, format TEXT, connections TEXT, tripleIds TEXT, remember INTEGER, hash TEXT)")
+        self._cur.execute("CREATE TABLE IF NOT EXISTS triples (id INTEGER PRIMARY KEY, subject INTEGER, predicate INTEGER, object INTEGER, owner INTEGER)")
+        # Databases created before the structural hashes were introduced have no hash column
+        if "hash" not in [column[1] for column in self._cur.execute("PRAGMA table_info(abstractions)").fetchall()]:
+            self._cur.execute("ALTER TABLE abstractions ADD COLUMN hash TEXT")
+            updateMissingAbstractionHashes(self)
+        self._cur.execute("CREATE INDEX IF NOT EXISTS abstractionsByHash ON abstractions (hash)")
+        self._cur.execute("CREATE INDEX IF NOT EXISTS abstractionsByFormat ON abstractions (format, data)")
+        self._ensureFullTextTables()
+        self._ensureChangeLog()
+        for column in ["owner", "subject", "predicate", "object"]:
+            self._cur.execute(f"CREATE INDEX IF NOT EXISTS triplesBy{column.capitalize()} ON triples ({column})")
+        # Without the fts5 tables the schema is checked again, in case a later sqlite library supports them
+        if self._hasFullTextTables:
+            self._cur.execute(f"PRAGMA user_version = {sqliteSchemaVersion}")
+        self._conn.commit()
+    def warmUp(self):
+        """
+        Reads the tables and indexes that searches use, so that the first searches do not wait for a cold page cache.
+        Writable databases also update the statistics of the sqlite query planner, which are stored in the database and used by later read-only opens as well.
+        Returns the number of read entries by table and index name.
+        """
+        numbersOfEntries = {}
+        for table in ["abstractions", "triples"]:
+            numbersOfEntries[table] = self._cur.execute(f"SELECT COUNT(*) FROM {table} NOT INDEXED").fetchall()[0][0]
+        # COUNT(*) would use the smallest index, so the first column of each index is counted
+        existingIndexes = set([row[0] for row in self._cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()])
+        for table, index, column in [("abstractions", "abstractionsByHash", "hash"), ("abstractions", "abstractionsByFormat", "format"),
+                                     *[("triples", f"triplesBy{column.capitalize()}", column) for column in ["owner", "subject", "predicate", "object"]]]:
+            if index in existingIndexes:
+                numbersOfEntries[index] = self._cur.execute(f"SELECT COUNT({column}) FROM {table} INDEXED BY {index}").fetchall()[0][0]
+        # Without statistics sqlite can pick the index of a column like the predicate, whose values are shared by most of the triples
+        if not self._readOnly:
+            self._cur.execute("PRAGMA analysis_limit = 1000")
+            self._cur.execute("ANALYZE abstractions")
+            self._cur.execute("ANALYZE triples")
+            self._conn.commit()
+        return numbersOfEntries
+    def _ensureFullTextTables(self):
+        """
+        Creates the fts5 tables of the data strings for the prefix, substring and full text searches if the sqlite library supports them.
+        The trigram table indexes substrings and the word table indexes words. Both are kept up to date by triggers.
+        """
+        self._hasFullTextTables = True
+        existingTables = set([row[0] for row in self._cur.execute("SELECT name FROM sqlite_master WHERE name IN ('abstractionDataTrigrams', 'abstractionDataWords')").fetchall()])
+        try:
+            for table, tokenizer in [("abstractionDataTrigrams", "trigram case_sensitive 1"), ("abstractionDataWords", "unicode61 remove_diacritics 0")]:
+                if table in existingTables:
+                    continue
+                self._cur.execute(f"CREATE VIRTUAL TABLE {table} USING fts5(data, content = 'abstractions', content_rowid = 'id', tokenize = '{tokenizer}')")
+                # Index the data of a database that was created before the table
+                self._cur.execute(f"INSERT INTO {table} (rowid, data) SELECT id, data FROM abstractions WHERE data IS NOT NULL")
+                self._cur.execute(f"CREATE TRIGGER IF NOT EXISTS {table}AfterInsert AFTER INSERT ON abstractions WHEN new.data IS NOT NULL BEGIN INSERT INTO {table} (rowid, data) VALUES (new.id, new.data); END")
+                self._cur.execute(f"CREATE TRIGGER IF NOT EXISTS {table}AfterDelete AFTER DELETE ON abstractions WHEN old.data IS NOT NULL BEGIN INSERT INTO {table} ({table}, rowid, data) VALUES ('delete', old.id, old.data); END")
+        except sqlite3.OperationalError:
+            # Without fts5 the data matches are checked on all data abstractions
+            self._hasFullTextTables = False
+    def _ensureChangeLog(self):
+        """
+        Creates the changeLog table, in which triggers record the creation, deletion and remembered flag changes of the abstractions by their structural hash.
+        The sequence of the log entries is monotonic, so that it can be used as a checkpoint of the database (see exportRALJDelta).
+        """
+        if self._cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'changeLog'").fetchone() != None:
+            return
+        self._cur.execute("CREATE TABLE changeLog (sequence INTEGER PRIMARY KEY AUTOINCREMENT, hash TEXT, change TEXT)")
+        self._cur.execute("CREATE INDEX changeLogByHash ON changeLog (hash, sequence)")
+        # The abstractions of a database that was created before the changeLog are logged as created
+        self._cur.execute("INSERT INTO changeLog (hash, change) SELECT hash, 'created' FROM abstractions ORDER BY id")
+        self._cur.execute("CREATE TRIGGER changeLogAfterInsert AFTER INSERT ON abstractions BEGIN INSERT INTO changeLog (hash, change) VALUES (new.hash, 'created'); END")
+        self._cur.execute("CREATE TRIGGER changeLogAfterDelete AFTER DELETE ON abstractions BEGIN INSERT INTO changeLog (hash, change) VALUES (old.hash, 'deleted'); END")
+        self._cur.execute("CREATE TRIGGER changeLogAfterRememberUpdate AFTER UPDATE OF remember ON abstractions WHEN old.remember != new.remember BEGIN INSERT INTO changeLog (hash, change) VALUES (new.hash, 'remembered'); END")
     def Node(self, *args):
         """
             Creates eather a data node or a constructed node depending on the arguments.
@@ -17,16 +144,11 @@ class SQLiteRALFramework:
             (data: string): Creates a data node with the given data and the "text" format.
             (baseConnections: list): Creates a constructed node with the given base connections.
         """
-        if type(args[0]) == str:
-            if len(args) == 1:
-                return self.DirectDataAbstraction(args[0], "text")
-            if len(args) == 2:
-                return self.DirectDataAbstraction(args[0], args[1])
-        if type(args[0]) == list:
-            return self.ConstructedAbstraction(args[0])
+        return createNodeFromArguments(self, args)
     def ConstructedAbstraction(self, baseConnections):
         # Iterate through the base connections and create the triple representations
         tripleRepresentations = []
+        tripleHashes = []
         for triple in baseConnections:
             if not 0 in triple or len(triple) != 3:
                 raise ValueError("The base connections must consist of triples with at least one element being 0.")
@@ -49,79 +171,235 @@ class SQLiteRALFramework:
             else:
                 raise ValueError("The object of a triple must be an abstraction.")
             tripleRepresentations.append((subject, predicate, object))
+            tripleHashes.append([0 if element == 0 else element.hash for element in triple])
         tripleRepresentations.sort()
         connectionRepresentationString = "|".join([",".join(triple) for triple in tripleRepresentations])
+        hash = constructedAbstractionHash(tripleHashes)
         # Check if the abstraction already exists
-        self._cur.execute("SELECT id FROM abstractions WHERE connections = ?", (connectionRepresentationString,))
+        self._cur.execute("SELECT id FROM abstractions WHERE hash = ?", (hash,))
         res = self._cur.fetchone()
         if res != None:
             return self._getAbstractionWrapperFromID(res[0])
         # Create the abstraction
-        self._cur.execute("INSERT INTO abstractions (data, format, connections, tripleIds, remember) VALUES (?, ?, ?, ?, ?)", (None, None, connectionRepresentationString, None, 0))
+        self._cur.execute("INSERT INTO abstractions (data, format, connections, tripleIds, remember, hash) VALUES (?, ?, ?, ?, ?, ?)", (None, None, connectionRepresentationString, None, 0, hash))
         result = self._getAbstractionWrapperFromID(self._cur.lastrowid)
         # Create the triples
         tripleIds = []
+        triples = []
         for triple in baseConnections:
-            self._cur.execute("INSERT INTO triples (subject, predicate, object, owner) VALUES (?, ?, ?, ?)", (triple[0].id if triple[0] != 0 else result.id, triple[1].id if triple[1] != 0 else result.id, triple[2].id if triple[2] != 0 else result.id, result.id))
+            triples.append((triple[0].id if triple[0] != 0 else result.id, triple[1].id if triple[1] != 0 else result.id, triple[2].id if triple[2] != 0 else result.id))
+            self._cur.execute("INSERT INTO triples (subject, predicate, object, owner) VALUES (?, ?, ?, ?)", triples[-1] + (result.id,))
             tripleIds.append(self._cur.lastrowid)
         tripleIdRepresentationString = ",".join([str(tripleId) for tripleId in tripleIds])
         self._cur.execute("UPDATE abstractions SET tripleIds = ? WHERE id = ?", (tripleIdRepresentationString, result.id))
         self._conn.commit()
+        self._emitChange("nodeCreated", result.id, None, None, triples)
         return result
     def DirectDataAbstraction(self, datastring, formatstring):
+        hash = dataAbstractionHash(datastring, formatstring)
         # Check if the abstraction already exists
-        self._cur.execute("SELECT id FROM abstractions WHERE data = ? AND format = ?", (datastring, formatstring))
+        self._cur.execute("SELECT id FROM abstractions WHERE hash = ?", (hash,))
         res = self._cur.fetchone()
         if res != None:
             return self._getAbstractionWrapperFromID(res[0])
         # Create the abstraction
-        self._cur.execute("INSERT INTO abstractions (data, format, connections, remember) VALUES (?, ?, ?, ?)", (datastring, formatstring, None, 0))
+        self._cur.execute("INSERT INTO abstractions (data, format, connections, remember, hash) VALUES (?, ?, ?, ?, ?)", (datastring, formatstring, None, 0, hash))
         self._conn.commit()
-        return self._getAbstractionWrapperFromID(self._cur.lastrowid)
+        result = self._getAbstractionWrapperFromID(self._cur.lastrowid)
+        self._emitChange("nodeCreated", result.id, datastring, formatstring, [])
+        return result
     def _getAbstractionWrapperFromID(self, id):
-        if id in self._wrappersByAbstractionID:
-            return self._wrappersByAbstractionID[id]
-        wrapper = SQLiteAbstraction(id, self)
-        self._wrappersByAbstractionID[id] = wrapper
-        return wrapper
+        return getAbstractionWrapper(id, self, SQLiteAbstraction)
     def __del__(self):
-        self.close()
+        # The connection is missing if the database could not be opened
+        if hasattr(self, "_conn"):
+            self.close()
     def close(self):
         for closefunction in self._onClose:
             closefunction(self)
         for wrapper in self._wrappersByAbstractionID.values():
             wrapper._safeDelete()
+        for connection in self._snapshotConnections:
+            connection.close()
+        self._snapshotConnections.clear()
         self._conn.close()
     @property
+    def journalMode(self):
+        """
+        The journal mode of the sqlite database. Snapshot isolated searches require the "wal" journal mode.
+        """
+        return self._cur.execute("PRAGMA journal_mode").fetchone()[0].lower()
+    @journalMode.setter
+    def journalMode(self, journalMode):
+        if journalMode.lower() not in sqliteJournalModes:
+            raise ValueError(f"Unknown journal mode {journalMode!r}.")
+        # sqlite keeps the old journal mode if the database does not support the new one, like in memory databases with "wal"
+        if self._cur.execute(f"PRAGMA journal_mode = {journalMode.lower()}").fetchone()[0].lower() != journalMode.lower():
+            raise ValueError(f"The database does not support the journal mode {journalMode!r}.")
+    def _getSnapshotCursor(self):
+        """
+        Returns a cursor of an idle read connection, on which a search can take a snapshot of the database without blocking the writes of the framework.
+        """
+        if self.journalMode != "wal":
+            raise ValueError("Snapshot isolated searches require the \"wal\" journal mode.")
+        if len(self._snapshotConnections) > 0:
+            connection = self._snapshotConnections.pop()
+        else:
+            connection = sqlite3.connect(**self._connectionArguments, factory = _InstrumentedConnection)
+            connection._counters = self._counters
+            connection.execute("PRAGMA query_only = 1")
+        cursor = connection.cursor(factory = _InstrumentedCursor)
+        cursor._counters = self._counters
+        return cursor
+    def _getAbstractionWrapperFromSnapshotID(self, id, cursor):
+        # The abstraction can have been deleted and its id reused since the snapshot of the cursor was taken
+        if self._cur.execute("SELECT hash FROM abstractions WHERE id = ?", (id,)).fetchone() != cursor.execute("SELECT hash FROM abstractions WHERE id = ?", (id,)).fetchone():
+            return SQLiteAbstraction(None, self)
+        return self._getAbstractionWrapperFromID(id)
+    @property
     def onClose(self):
         return self._onClose
+    @property
+    def onChange(self):
+        """
+        The set of functions that are called with a change event dict whenever an abstraction is created or deleted or its remembered flag changes.
+        The event contains the "type" ("nodeCreated", "nodeDeleted" or "rememberedChanged") and the "key" of the abstraction, which is its id.
+        The events of created and deleted abstractions also contain the "data" and "format" of the abstraction and the (subject, predicate, object) ids of its "triples".
+        The events of changed remembered flags also contain the new "remembered" flag.
+        """
+        return self._onChange
+    def _emitChange(self, eventType, id, data, format, triples):
+        if len(self._onChange) == 0:
+            return
+        event = {"type": eventType, "key": id, "data": data, "format": format, "triples": triples}
+        for changeFunction in [*self._onChange]:
+            changeFunction(event)
+    def _emitRememberedChange(self, id, remembered):
+        if len(self._onChange) == 0:
+            return
+        event = {"type": "rememberedChanged", "key": id, "remembered": remembered}
+        for changeFunction in [*self._onChange]:
+            changeFunction(event)
+    @property
+    def counters(self):
+        """
+        The framework wide counters "sqlStatements", "commits", "wrapperCreations", "deletedAbstractions" and "cascadedDeletions".
+        """
+        return self._counters
     def isValidAbstraction(self, abstraction):
         return type(abstraction) == SQLiteAbstraction and abstraction.RALFramework == self and abstraction._id != None
-    def search(self, triples = [], data = {}, constructed = {}):
-        return self.searchRALJPattern(data, constructed, triples)
-    def searchRALJPattern(self, data = {}, constructed = {}, triples = []):
-        # Create the search modules
+    def search(self, triples = [], data = {}, constructed = {}, profile = None, resultMode = "abstractions", parameters = None, executor = "recursive", isolation = "shared"):
+        return self.searchRALJPattern(data, constructed, triples, profile, resultMode, parameters, executor, isolation)
+    def searchRALJPattern(self, data = {}, constructed = {}, triples = [], profile = None, resultMode = "abstractions", parameters = None, executor = "recursive", isolation = "shared"):
+        """
+        Returns all parameter combinations that match the pattern.
+        resultMode "abstractions" yields a dict with abstractions for each combination.
+        resultMode "ids" yields a tuple with the parameter values in the order of parameters (by default all parameter names sorted) and abstraction ids instead of abstractions.
+        resultMode "columns" returns a dict with one column per parameter. Abstraction ids are collected in an array("q") and data and format values in a list.
+        resultMode "numpy" returns the columns as numpy arrays.
+        The "abstractions" and "ids" modes are lazy: the pattern is neither prepared nor searched before the first result is requested.
+        Ids can be turned into abstractions with getAbstractionFromID.
+        If a SearchProfile is given as profile, the statistics of the used search modules are recorded in it.
+        executor "recursive" extends one parameter combination at a time, "batch" extends batches of them with hash joins (see batch_search)
+        and "numpy" additionally matches integer join keys with numpy.
+        isolation "shared" reads with the cursor of the framework, so that writes during the iteration of the results (like the deletion of abstractions whose wrappers are dropped) can change the rows that are still to be read.
+        isolation "snapshot" reads the database inside of a read transaction of a separate connection, which sees the database as it was at the first result without blocking the writes.
+        It requires the "wal" journal mode (see journalMode). Abstractions of the results that have been deleted since the snapshot was taken are returned as deleted abstractions.
+        Fixed data values of a snapshot search are looked up in the snapshot instead of being created.
+        """
+        if isolation != "shared" and isolation != "snapshot":
+            raise ValueError(f"Unknown isolation {isolation!r}.")
+        if executor != "recursive" and executor != "batch" and executor != "numpy":
+            raise ValueError(f"Unknown executor {executor!r}.")
+        if resultMode == "abstractions" or resultMode == "ids":
+            # The search modules are only created (which can create the fixed data abstractions) when the first result is requested
+            return self._searchRALJPatternLazily(data, constructed, triples, profile, resultMode, parameters, executor, isolation)
+        if resultMode == "columns" or resultMode == "numpy":
+            # The columns contain all results, so they are collected right away
+            with self._searchCursor(isolation) as cursor:
+                searchModules, knownParameters, results = self._searchAllSearchModules(data, constructed, triples, profile, executor, cursor)
+                if parameters == None:
+                    parameters = getResultParameters(searchModules, knownParameters)
+                rows = (tuple([knownParameters[parameter] for parameter in parameters]) for knownParameters in results)
+                valueParameters = set([parameter for searchModule in searchModules if type(searchModule) == DataSearchModule for parameter in (searchModule.dataParameterName, searchModule.format[0] if type(searchModule.format) == list else None) if parameter != None])
+                return collectResultColumns(rows, parameters, valueParameters, resultMode == "numpy")
+        raise ValueError(f"Unknown result mode {resultMode!r}.")
+    def _searchRALJPatternLazily(self, data, constructed, triples, profile, resultMode, parameters, executor, isolation):
+        # The snapshot connection is only taken from the pool when the first result is requested and returned when the generator is closed
+        with self._searchCursor(isolation) as cursor:
+            searchModules, knownParameters, results = self._searchAllSearchModules(data, constructed, triples, profile, executor, cursor)
+            if resultMode == "abstractions":
+                # Replace all id parameters with the corresponding abstractions
+                getAbstraction = self._getAbstractionWrapperFromID if cursor == None else getSnapshotAbstractionGetter(self, cursor)
+                for knownParameters in results:
+                    yield {key : (getAbstraction(value) if type(value) == int else value) for key, value in knownParameters.items()}
+                return
+            if parameters == None:
+                parameters = getResultParameters(searchModules, knownParameters)
+            for knownParameters in results:
+                yield tuple([knownParameters[parameter] for parameter in parameters])
+    def _searchAllSearchModules(self, data, constructed, triples, profile, executor, cursor):
+        """
+        Creates the search modules of the pattern, which read with the cursor, and returns them together with the known parameters and the generator of the results.
+        """
+        searchModules, knownParameters = self._createSearchModules(data, constructed, triples, cursor)
+        # Search for all possible parameter combinations
+        if executor == "recursive":
+            results = searchAllSearchModules(searchModules, knownParameters, profile)
+        else:
+            results = searchAllSearchModulesInBatches(searchModules, knownParameters, profile, useNumpy = executor == "numpy")
+        return searchModules, knownParameters, results
+    @contextmanager
+    def _searchCursor(self, isolation):
+        """
+        Provides the cursor that the search modules of a search with the isolation read with: None (the cursor of the framework) for "shared" searches
+        and a pooled read cursor inside of a read transaction for "snapshot" searches, whose connection is returned to the pool afterwards.
+        """
+        if isolation == "shared":
+            yield None
+            return
+        cursor = self._getSnapshotCursor()
+        try:
+            cursor.execute("BEGIN")
+            # The snapshot is taken with the first read of the transaction
+            cursor.execute("SELECT 1 FROM abstractions LIMIT 1")
+            yield cursor
+        finally:
+            cursor.connection.rollback()
+            self._snapshotConnections.append(cursor.connection)
+    def explain(self, triples = [], data = {}, constructed = {}):
+        """
+        Returns the steps that a search with the same pattern takes together with the estimated number of rows of each step.
+        """
+        # Explaining a search must not change the database, so fixed data values are searched instead of created
+        searchModules, knownParameters = self._createSearchModules(data, constructed, triples, createDataAbstractions = False)
+        return explainSearchModules(searchModules, knownParameters)
+    def materializedView(self, triples = [], data = {}, constructed = {}):
+        """
+        Returns a MaterializedView of the pattern, whose results are updated with the onChange events instead of searching the whole pattern again.
+        """
+        return MaterializedView(self, triples, data, constructed)
+    def _createSearchModules(self, data, constructed, triples, cursor = None, createDataAbstractions = True):
+        # Create the search modules, which read the database with the cursor
         dataBlock, constructedBlock, tripleBlock = data, constructed, triples
         knownParameters = {}
         searchModules = []
         for dataParam, (data, format) in dataBlock.items():
-            if type(data) == str and type(format) == str:
+            # A read-only database can not create the data abstraction and a snapshot must not see it, so it is searched instead
+            if type(data) == str and type(format) == str and createDataAbstractions and not self._readOnly and cursor == None:
                 knownParameters[dataParam] = self.DirectDataAbstraction(data, format).id
             else:
-                searchModules.append(DataSearchModule(dataParam, data, format, self))
+                searchModules.append(DataSearchModule(dataParam, data, format, self, cursor))
         for constructedParam, baseConnections in constructedBlock.items():
             exactNumberOfBaseConnections = True
             if len(baseConnections) > 0 and baseConnections[-1] == "+":
                 baseConnections = baseConnections[:-1]
                 exactNumberOfBaseConnections = False
             for i in range(len(baseConnections)):
-                searchModules.append(ConstructedSearchModule(constructedParam, baseConnections, i, exactNumberOfBaseConnections, self))
+                searchModules.append(ConstructedSearchModule(constructedParam, baseConnections, i, exactNumberOfBaseConnections, self, cursor))
         for subj, pred, obj in tripleBlock:
-            searchModules.append(TripleSearchModule(subj, pred, obj, self))
-        # Search for all possible parameter combinations
-        for knownParameters in searchAllSearchModules(searchModules, knownParameters):
-            # Replace all id parameters with the corresponding abstractions
-            yield {key : (self._getAbstractionWrapperFromID(value) if type(value) == int else value) for key, value in knownParameters.items()}
+            searchModules.append(TripleSearchModule(subj, pred, obj, self, cursor))
+        return searchModules, knownParameters
     def getStringRepresentationFromAbstraction(self, abstraction):
         if type(abstraction) != SQLiteAbstraction:
             raise ValueError("The abstraction must be a SQLiteAbstraction.")
@@ -132,6 +410,250 @@ class SQLiteRALFramework:
         if res == None:
             raise ValueError("The abstraction with the given id does not exist.")
         return self._getAbstractionWrapperFromID(res[0])
+    def getAbstractionFromID(self, id):
+        """
+        Returns the abstraction with the given id, like the ids returned by the "ids" and "columns" search result modes.
+        """
+        if self._cur.execute("SELECT id FROM abstractions WHERE id = ?", (id,)).fetchone() == None:
+            raise ValueError("The abstraction with the given id does not exist.")
+        return self._getAbstractionWrapperFromID(id)
+    def getAbstractionFromHash(self, hash):
+        """
+        Returns the abstraction with the given structural hash or None if there is no such abstraction.
+        """
+        self._cur.execute("SELECT id FROM abstractions WHERE hash = ?", (hash,))
+        res = self._cur.fetchone()
+        if res == None:
+            return None
+        return self._getAbstractionWrapperFromID(res[0])
+    def _getStructuralRecords(self):
+        """
+        Yields a (hash, data, format, connectionHashes, remembered) record for every abstraction without creating wrappers.
+        """
+        rows = self._cur.execute("SELECT id, data, format, connections, hash, remember FROM abstractions").fetchall()
+        hashesById = {row[0] : row[4] for row in rows}
+        for id, data, format, connections, hash, remember in rows:
+            if data != None:
+                yield (hash, data, format, None, remember != 0)
+            else:
+                yield (hash, None, None, [[0 if element == "-" else hashesById[int(element)] for element in triple.split(",")] for triple in connections.split("|")], remember != 0)
+    def _findAbstractionKeysByHashes(self, hashes):
+        hashes = list(hashes)
+        idsByHash = {}
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            idsByHash.update(self._cur.execute("SELECT hash, id FROM abstractions WHERE hash IN (" + ",".join(["?"] * len(chunk)) + ")", chunk).fetchall())
+        return idsByHash
+    def _createAbstractionsFromRecords(self, records):
+        """
+        Inserts the abstractions of the (hash, data, format, connectionKeys) records with a single commit and returns their ids by hash.
+        The records must not exist yet and the connection keys must be ids of existing abstractions or hashes of earlier records.
+        """
+        idsByHash = {}
+        createdAbstractions = []
+        for hash, data, format, connectionIds in records:
+            if connectionIds == None:
+                self._cur.execute("INSERT INTO abstractions (data, format, connections, remember, hash) VALUES (?, ?, ?, ?, ?)", (data, format, None, 0, hash))
+                idsByHash[hash] = self._cur.lastrowid
+                createdAbstractions.append((idsByHash[hash], data, format, []))
+                continue
+            connectionIds = [[idsByHash[element] if type(element) == str else element for element in triple] for triple in connectionIds]
+            connectionRepresentationString = "|".join(sorted([",".join(["-" if element == 0 else str(element) for element in triple]) for triple in connectionIds]))
+            self._cur.execute("INSERT INTO abstractions (data, format, connections, tripleIds, remember, hash) VALUES (?, ?, ?, ?, ?, ?)", (None, None, connectionRepresentationString, None, 0, hash))
+            id = idsByHash[hash] = self._cur.lastrowid
+            tripleIds = []
+            triples = [tuple([id if element == 0 else element for element in triple]) for triple in connectionIds]
+            for triple in triples:
+                self._cur.execute("INSERT INTO triples (subject, predicate, object, owner) VALUES (?, ?, ?, ?)", triple + (id,))
+                tripleIds.append(self._cur.lastrowid)
+            self._cur.execute("UPDATE abstractions SET tripleIds = ? WHERE id = ?", (",".join([str(tripleId) for tripleId in tripleIds]), id))
+            createdAbstractions.append((id, None, None, triples))
+        self._conn.commit()
+        for id, data, format, triples in createdAbstractions:
+            self._emitChange("nodeCreated", id, data, format, triples)
+        return idsByHash
+    def importRALJData(self, data, jsonNodeIDs = None, resolveHashReferences = False):
+        """
+        Imports the RALJ data with a few sql statements per dependency level and a single commit instead of creating every abstraction on its own.
+        Returns the abstractions of the given jsonNodeIDs by their json node id. Without jsonNodeIDs no wrappers are created and the ids of all imported abstractions are returned by their json node id.
+        With resolveHashReferences a reference "#" + hash that is not defined in the RALJ data refers to the existing abstraction with the structural hash (used by importRALJDelta).
+        """
+        if type(data) != list or len(data) > 4:
+            raise ValueError("The RALJ data must be a list of at most four blocks.")
+        dataConceptBlock = data[0] if len(data) > 0 else {}
+        constructedConceptBlock = data[1] if len(data) > 1 else {}
+        if any([len(block) > 0 for block in data[2:]]):
+            raise ValueError("Direct abstractions are not supported by the SQLiteRALFramework.")
+        definedJsonNodeIDs = [jsonNodeID for dataConcepts in dataConceptBlock.values() for jsonNodeID in dataConcepts.values()] + [*constructedConceptBlock]
+        if jsonNodeIDs != None:
+            undefinedJsonNodeIDs = set(jsonNodeIDs).difference(definedJsonNodeIDs)
+            if len(undefinedJsonNodeIDs) > 0:
+                raise ValueError(f"The requested json node {next(iter(undefinedJsonNodeIDs))!r} is not defined in the RALJ data.")
+        largestIdBefore = self._cur.execute("SELECT COALESCE(MAX(id), 0) FROM abstractions").fetchone()[0]
+        try:
+            # Stage the blocks in temporary tables, where self-connections are NULL
+            self._cur.execute("CREATE TEMP TABLE importedNodes (jsonNodeID TEXT PRIMARY KEY, data TEXT, format TEXT, level INTEGER, hash TEXT, id INTEGER)")
+            self._cur.execute("CREATE TEMP TABLE importedTriples (owner TEXT, subject TEXT, predicate TEXT, object TEXT)")
+            self._cur.execute("CREATE TEMP TABLE importedReferences (owner TEXT, reference TEXT)")
+            try:
+                self._cur.executemany("INSERT INTO importedNodes (jsonNodeID, data, format, level) VALUES (?, ?, ?, 0)", [(jsonNodeID, data, format) for format, dataConcepts in dataConceptBlock.items() for data, jsonNodeID in dataConcepts.items()])
+                self._cur.executemany("INSERT INTO importedNodes (jsonNodeID) VALUES (?)", [(jsonNodeID,) for jsonNodeID in constructedConceptBlock])
+            except sqlite3.IntegrityError:
+                # The json node ids are the primary key of the staged nodes
+                duplicateJsonNodeID = next(jsonNodeID for jsonNodeID, count in Counter(definedJsonNodeIDs).items() if count > 1)
+                raise ValueError(f"The json node {duplicateJsonNodeID!r} is defined more than once in the RALJ data.") from None
+            self._cur.executemany("INSERT INTO importedTriples (owner, subject, predicate, object) VALUES (?, ?, ?, ?)", [(jsonNodeID, *[None if item == 0 else item for item in triple]) for jsonNodeID, baseConnections in constructedConceptBlock.items() for triple in baseConnections])
+            self._cur.execute("INSERT INTO importedReferences SELECT DISTINCT owner, reference FROM (SELECT owner, subject AS reference FROM importedTriples UNION ALL SELECT owner, predicate FROM importedTriples UNION ALL SELECT owner, object FROM importedTriples) WHERE reference IS NOT NULL")
+            self._cur.execute("CREATE INDEX temp.importedNodesByLevel ON importedNodes (level)")
+            self._cur.execute("CREATE INDEX temp.importedTriplesByOwner ON importedTriples (owner)")
+            self._cur.execute("CREATE INDEX temp.importedReferencesByOwner ON importedReferences (owner)")
+            self._cur.execute("CREATE INDEX temp.importedReferencesByReference ON importedReferences (reference)")
+            # Existing abstractions are staged below the data abstractions
+            if resolveHashReferences:
+                self._cur.execute("INSERT INTO importedNodes (jsonNodeID, level, hash, id) SELECT reference, -1, abstractions.hash, abstractions.id FROM (SELECT DISTINCT reference FROM importedReferences) JOIN abstractions ON abstractions.hash = substr(reference, 2)" +
+                                  " WHERE reference GLOB '#*' AND reference NOT IN (SELECT jsonNodeID FROM importedNodes)")
+            missingReference = self._cur.execute("SELECT reference FROM importedReferences WHERE reference NOT IN (SELECT jsonNodeID FROM importedNodes) LIMIT 1").fetchone()
+            if missingReference != None:
+                raise ValueError(f"The json node {missingReference[0]!r} is not defined in the RALJ data.")
+            # Import the data abstractions and then the constructed abstractions level by level
+            importRALJLevel(self, 0, largestIdBefore)
+            level = 1
+            while assignRALJLevel(self, level):
+                importRALJLevel(self, level, largestIdBefore)
+                level += 1
+            if self._cur.execute("SELECT 1 FROM importedNodes WHERE level IS NULL LIMIT 1").fetchone() != None:
+                raise ValueError("The base connections of the RALJ data contain a cycle.")
+            self._cur.execute("UPDATE abstractions SET tripleIds = (SELECT group_concat(id, ',') FROM (SELECT id FROM triples WHERE owner = abstractions.id ORDER BY id)) WHERE id > ? AND data IS NULL", (largestIdBefore,))
+            if jsonNodeIDs == None:
+                result = dict(self._cur.execute("SELECT jsonNodeID, id FROM importedNodes WHERE level >= 0").fetchall())
+            else:
+                idsByJsonNodeID = dict(self._cur.execute("SELECT importedNodes.jsonNodeID, importedNodes.id FROM json_each(?) JOIN importedNodes ON importedNodes.jsonNodeID = json_each.value", (json.dumps(list(jsonNodeIDs)),)).fetchall())
+                result = {jsonNodeID : self._getAbstractionWrapperFromID(idsByJsonNodeID[jsonNodeID]) for jsonNodeID in jsonNodeIDs}
+            self._conn.commit()
+        except:
+            self._conn.rollback()
+            raise
+        finally:
+            for table in ["importedNodes", "importedTriples", "importedReferences"]:
+                self._cur.execute(f"DROP TABLE IF EXISTS temp.{table}")
+        if len(self._onChange) > 0:
+            triplesByOwner = {}
+            for subject, predicate, object, owner in self._cur.execute("SELECT subject, predicate, object, owner FROM triples WHERE owner > ?", (largestIdBefore,)).fetchall():
+                triplesByOwner.setdefault(owner, []).append((subject, predicate, object))
+            for id, data, format in self._cur.execute("SELECT id, data, format FROM abstractions WHERE id > ? ORDER BY id", (largestIdBefore,)).fetchall():
+                self._emitChange("nodeCreated", id, data, format, triplesByOwner.get(id, []))
+        return result
+    def checkpoint(self):
+        """
+        Returns the sequence number of the last change of the database, which can be passed to exportRALJDelta later on.
+        """
+        # The sequence counter of the changeLog keeps counting after the changeLog has been truncated
+        return self._cur.execute("SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'changeLog'), 0)").fetchone()[0]
+    def truncateChangeLog(self, checkpoint):
+        """
+        Deletes the changes up to the checkpoint from the changeLog, which otherwise grows with every change of the database.
+        Afterwards deltas can only be exported since the checkpoint or a later one.
+        """
+        if checkpoint > self.checkpoint():
+            raise ValueError("The checkpoint lies in the future of the database.")
+        self._cur.execute("DELETE FROM changeLog WHERE sequence <= ?", (checkpoint,))
+        self._conn.commit()
+    def exportRALJDelta(self, since):
+        """
+        Returns the changes of the database after the checkpoint since as a dict with
+            - "since" and "checkpoint": the checkpoints the delta leads from and to
+            - "ralj": the RALJ data of the abstractions that were created since, where abstractions that already existed are referred to as "#" + their structural hash
+            - "deleted": the structural hashes of the abstractions that were deleted since
+            - "remembered": the remembered flags of the created abstractions and of the abstractions whose flag changed by their structural hash
+        Abstractions that were created and deleted again in between are left out.
+        Raises a ValueError if the changes after since have been truncated (see truncateChangeLog).
+        """
+        checkpoint = self.checkpoint()
+        # The sequence numbers have no gaps, so the oldest logged change follows the checkpoint of the last truncation
+        if since < self._cur.execute("SELECT COALESCE(MIN(sequence) - 1, ?) FROM changeLog", (checkpoint,)).fetchone()[0]:
+            raise ValueError("The changes since the checkpoint have been truncated from the changeLog.")
+        # The first creation or deletion after the checkpoint tells if the abstraction existed at the checkpoint
+        changes = self._cur.execute("SELECT hash, (SELECT change FROM changeLog AS first WHERE first.hash = changeLog.hash AND first.sequence > ? AND first.change != 'remembered' ORDER BY first.sequence LIMIT 1) FROM changeLog WHERE sequence > ? AND sequence <= ? GROUP BY hash",
+                                    (since, since, checkpoint)).fetchall()
+        idsByHash = self._findAbstractionKeysByHashes([hash for hash, firstChange in changes])
+        createdHashes = [hash for hash, firstChange in changes if hash in idsByHash and firstChange == "created"]
+        deletedHashes = [hash for hash, firstChange in changes if hash not in idsByHash and firstChange != "created"]
+        rows = self._cur.execute("SELECT abstractions.id, data, format, connections, remember, hash FROM json_each(?) JOIN abstractions ON abstractions.id = json_each.value ORDER BY abstractions.id",
+                                 (json.dumps([idsByHash[hash] for hash, firstChange in changes if hash in idsByHash]),)).fetchall()
+        # Base abstractions that are not part of the delta are referred to by their structural hash
+        jsonNodeIDsByID = {idsByHash[hash] : str(jsonNodeIndex) for jsonNodeIndex, hash in enumerate(createdHashes, 1)}
+        baseIds = set([int(element) for id, data, format, connections, remember, hash in rows if id in jsonNodeIDsByID and connections != None
+                       for triple in connections.split("|") for element in triple.split(",") if element != "-"]) - set(jsonNodeIDsByID)
+        jsonNodeIDsByID.update({id : "#" + hash for id, hash in self._cur.execute("SELECT abstractions.id, hash FROM json_each(?) JOIN abstractions ON abstractions.id = json_each.value", (json.dumps(list(baseIds)),)).fetchall()})
+        dataConceptBlock = {}
+        constructedConceptBlock = {}
+        for id, data, format, connections, remember, hash in rows:
+            if id not in jsonNodeIDsByID or jsonNodeIDsByID[id][0] == "#":
+                continue
+            if data != None:
+                dataConceptBlock.setdefault(format, {})[data] = jsonNodeIDsByID[id]
+            else:
+                constructedConceptBlock[jsonNodeIDsByID[id]] = [[0 if element == "-" else jsonNodeIDsByID[int(element)] for element in triple.split(",")] for triple in connections.split("|")]
+        return {"since": since, "checkpoint": checkpoint, "ralj": [dataConceptBlock, constructedConceptBlock], "deleted": deletedHashes,
+                "remembered": {hash : remember != 0 for id, data, format, connections, remember, hash in rows}}
+    def importRALJDelta(self, delta):
+        """
+        Applies a delta of exportRALJDelta, so that the database gets the changes of the exported database since the checkpoint of the delta.
+        Returns the ids of the created abstractions by their json node id.
+        """
+        # Deleting an abstraction also deletes the abstractions built on it, which have been deleted in the exported database as well
+        forcedDeletionIds = set(self._findAbstractionKeysByHashes(delta["deleted"]).values())
+        deletedIds = set()
+        while len(forcedDeletionIds) > 0:
+            id = forcedDeletionIds.pop()
+            deletedIds.add(id)
+            forcedDeletionIds |= forceAbstractionDeletion(id, self).difference(deletedIds)
+        # The base abstractions are only deleted if the delta lists them, since they can be kept alive by wrappers in the exported database
+        safeDeletionIds = set(deletedIds)
+        while len(safeDeletionIds) > 0:
+            safeDeletionIds |= checkForSafeAbstractionDeletion(safeDeletionIds.pop(), self).intersection(deletedIds)
+        idsByJsonNodeID = self.importRALJData(delta["ralj"], resolveHashReferences = True)
+        rememberedChanges = [(1 if remembered else 0, hash) for hash, remembered in delta["remembered"].items()]
+        changedIds = self._cur.execute("SELECT abstractions.id, abstractions.remember FROM json_each(?) JOIN abstractions ON abstractions.hash = json_each.key", (json.dumps(delta["remembered"]),)).fetchall() if len(self._onChange) > 0 else []
+        self._cur.executemany("UPDATE abstractions SET remember = ? WHERE hash = ?", rememberedChanges)
+        self._conn.commit()
+        for id, remember in changedIds:
+            remembered = self._cur.execute("SELECT remember FROM abstractions WHERE id = ?", (id,)).fetchone()[0] != 0
+            if remembered != (remember != 0):
+                self._emitRememberedChange(id, remembered)
+        return idsByJsonNodeID
+    def _abstractionFromKey(self, key):
+        return self._getAbstractionWrapperFromID(key)
+    def closure(self, abstractions):
+        """
+        Returns the given abstractions and all abstractions they are built from in topological order, so that every abstraction comes after the abstractions in its base connections.
+        """
+        return [self._getAbstractionWrapperFromID(id) for id in self._traverseTriples(abstractions, [("owner", "subject"), ("owner", "predicate"), ("owner", "object")], False)]
+    def dependents(self, abstractions):
+        """
+        Returns the given abstractions and all abstractions that are built on them in topological order, so that every abstraction comes after the abstractions in its base connections.
+        """
+        return [self._getAbstractionWrapperFromID(id) for id in self._traverseTriples(abstractions, [("subject", "owner"), ("predicate", "owner"), ("object", "owner")], True)]
+    def _traverseTriples(self, abstractions, steps, reverse):
+        """
+        Follows the triples along the (fromColumn, toColumn) steps starting at the abstractions with a single recursive query and returns the ids of all reached abstractions.
+        The ids are in depth first post order of the steps, or in the reversed order if reverse is True.
+        """
+        # The recursive query reaches every abstraction once. The steps between the reached abstractions are returned with them and ordered afterwards.
+        joins = [(toColumnName, f"FROM triples JOIN reached ON triples.{fromColumnName} = reached.id WHERE triples.{toColumnName} != reached.id") for fromColumnName, toColumnName in steps]
+        startIds = [abstraction.id for abstraction in abstractions]
+        res = self._cur.execute("WITH RECURSIVE reached(id) AS (SELECT value FROM json_each(?)" + "".join([f" UNION SELECT triples.{toColumnName} {join}" for toColumnName, join in joins]) +
+                                ") SELECT id, NULL FROM reached" + "".join([f" UNION ALL SELECT reached.id, triples.{toColumnName} {join}" for toColumnName, join in joins]),
+                                (json.dumps(startIds),)).fetchall()
+        neighboursById = {}
+        for fromId, toId in res:
+            neighbours = neighboursById.setdefault(fromId, [])
+            if toId != None:
+                neighbours.append(toId)
+        postOrder = depthFirstPostOrder(startIds, lambda id: neighboursById[id])
+        if reverse:
+            postOrder.reverse()
+        return postOrder
     def getAllNodes(self):
         self._cur.execute("SELECT id FROM abstractions")
         return [self._getAbstractionWrapperFromID(res[0]) for res in self._cur.fetchall()]
@@ -146,6 +668,7 @@ class SQLiteRALFramework:
 class SQLiteAbstraction:
     def __init__(self, abstractionId, framework):
         self._id = abstractionId
+        self._hash = None
         self.RALFramework = framework
     @property
     def framework(self):
@@ -156,6 +679,13 @@ class SQLiteAbstraction:
             raise ValueError("The abstraction has been deleted.")
         return self._id
     @property
+    def hash(self):
+        # The structural hash never changes, so it is only queried once
+        if self._hash == None:
+            self.RALFramework._cur.execute("SELECT hash FROM abstractions WHERE id = ?", (self.id,))
+            self._hash = self.RALFramework._cur.fetchone()[0]
+        return self._hash
+    @property
     def data(self):
         self.RALFramework._cur.execute("SELECT data FROM abstractions WHERE id = ?", (self.id,))
         return self.RALFramework._cur.fetchone()[0]
@@ -169,23 +699,21 @@ class SQLiteAbstraction:
         data, format, connections = self.RALFramework._cur.fetchone()
         if data != None:
             return (data, format)
-        triples = connections.split("|")
-        triples = [tuple([0 if element == "-" else self.RALFramework._getAbstractionWrapperFromID(int(element)) for element in triple.split(",")]) for triple in triples]
-        return frozenset(triples)
+        return parseConnectionRepresentation(connections, self.RALFramework)
     @property
     def connections(self):
         self.RALFramework._cur.execute("SELECT connections FROM abstractions WHERE id = ?", (self.id,))
-        triples = self.RALFramework._cur.fetchone()[0].split("|")
-        triples = [tuple([0 if element == "-" else self.RALFramework._getAbstractionWrapperFromID(int(element)) for element in triple.split(",")]) for triple in triples]
-        return frozenset(triples)
+        return parseConnectionRepresentation(self.RALFramework._cur.fetchone()[0], self.RALFramework)
     @property
     def remembered(self):
         self.RALFramework._cur.execute("SELECT remember FROM abstractions WHERE id = ?", (self.id,))
         return self.RALFramework._cur.fetchone()[0] != 0
     @remembered.setter
     def remembered(self, value):
-        self.RALFramework._cur.execute("UPDATE abstractions SET remember = ? WHERE id = ?", (1 if value else 0, self.id))
+        self.RALFramework._cur.execute("UPDATE abstractions SET remember = ? WHERE id = ? AND remember != ?", (1 if value else 0, self.id, 1 if value else 0))
         self.RALFramework._conn.commit()
+        if self.RALFramework._cur.rowcount > 0:
+            self.RALFramework._emitRememberedChange(self.id, bool(value))
     @property
     def type(self):
         self.RALFramework._cur.execute("SELECT data FROM abstractions WHERE id = ?", (self.id,))
@@ -204,57 +732,83 @@ class SQLiteAbstraction:
             return
         id = self.id
         self._id = None
+        if self.RALFramework._readOnly:
+            return
         # Check if the abstraction can be savely deleted from the sqlite database
-        idsToCheckForDeletion = set([id])
-        while len(idsToCheckForDeletion) > 0:
-            id = idsToCheckForDeletion.pop()
-            idsToCheckForDeletion |= checkForSafeAbstractionDeletion(id, self.RALFramework)
+        deleteAbstractionSafely(id, self.RALFramework, checkForSafeAbstractionDeletion)
     def forceDeletion(self):
         if self._id == None:
             return
-        forcedDeletionIds = {self._id}
-        safeDeletionIds = set()
-        while len(forcedDeletionIds) > 0:
-            id = forcedDeletionIds.pop()
-            safeDeletionIds.add(id)
-            forcedDeletionIds |= forceAbstractionDeletion(id, self.RALFramework).difference(safeDeletionIds)
-        while len(safeDeletionIds) > 0:
-            id = safeDeletionIds.pop()
-            safeDeletionIds |= checkForSafeAbstractionDeletion(id, self.RALFramework)
+        forceAbstractionDeletionCascade(self._id, self.RALFramework, forceAbstractionDeletion, checkForSafeAbstractionDeletion)
     
 class DataSearchModule:
-    def __init__(self, param, data, format, framework):
+    def __init__(self, param, data, format, framework, cursor = None):
         self.framework = framework
+        self.cursor = framework._cur if cursor == None else cursor
         self.param = param
         self.data = data
         self.format = format
-        self.parameterNames = ({param} if type(param) == str else set()) | ({data[0]} if type(data) == list else set()) | ({format[0]} if type(format) == list else set())
+        # The data can also be a prefix, substring or full text match (see data_text_search)
+        self.dataMatch = getDataMatch(data) if type(data) == dict else None
+        self.dataParameterName = data[0] if type(data) == list else data.get("parameter", None) if type(data) == dict else None
+        self.parameterNames = ({param} if type(param) == str else set()) | ({self.dataParameterName} if self.dataParameterName != None else set()) | ({format[0]} if type(format) == list else set())
+        self.dependencyParameterNames = self.parameterNames
+        self.allowsFullScan = len(self.parameterNames) == (type(param) == str) + (self.dataParameterName != None) + (type(format) == list)
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"DataSearchModule({self.param!r}, {self.data!r}, {self.format!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        dataMatchConditions, dataMatchParameters = getDataMatchConditions(self.dataMatch, self.framework._hasFullTextTables) if self.dataMatch != None else ([], [])
+        return estimateNumberOfMatchingRows(self.cursor, "abstractions", ["data IS NOT NULL", *dataMatchConditions], {
+            **({"id": self.param.id} if type(self.param) == SQLiteAbstraction else {}),
+            **({"data": self.data} if type(self.data) == str else {}),
+            **({"format": self.format} if type(self.format) == str else {})}, [
+            *(["id"] if type(self.param) == str and self.param in knownParameterNames else []),
+            *(["data"] if self.dataParameterName != None and self.dataParameterName in knownParameterNames else []),
+            *(["format"] if type(self.format) == list and self.format[0] in knownParameterNames else [])], dataMatchParameters)
     def search(self, knownParameters):
         paramValue = self.param.id if type(self.param) == SQLiteAbstraction else knownParameters.get(self.param, None)
-        dataValue = self.data if type(self.data) == str else knownParameters.get(self.data[0], None)
+        dataValue = self.data if type(self.data) == str else knownParameters.get(self.dataParameterName, None) if self.dataParameterName != None else None
         formatValue = self.format if type(self.format) == str else knownParameters.get(self.format[0], None)
-        self.framework._cur.execute("SELECT id, data, format FROM abstractions" + (" WHERE " if (paramValue, dataValue, formatValue) != (None, None, None) else "") +
-                                    " AND ".join([
-                                        *(["id = ?"] if paramValue != None else []), 
-                                        *(["data = ?"] if dataValue != None else []), 
-                                        *(["format = ?"] if formatValue != None else [])]), 
+        # The fts5 tables narrow the rows down to the data matches
+        dataMatchConditions, dataMatchParameters = getDataMatchConditions(self.dataMatch, self.framework._hasFullTextTables) if self.dataMatch != None and dataValue == None and paramValue == None else ([], [])
+        conditions = [
+            *(["id = ?"] if paramValue != None else []), 
+            *(["data = ?"] if dataValue != None else []), 
+            *(["format = ?"] if formatValue != None else []),
+            *dataMatchConditions]
+        self.cursor.execute("SELECT id, data, format FROM abstractions" + (" WHERE " if len(conditions) > 0 else "") + " AND ".join(conditions), 
                                     tuple([
                                         *([paramValue] if paramValue != None else []), 
                                         *([dataValue] if dataValue != None else []), 
-                                        *([formatValue] if formatValue != None else [])]))
-        matchingAbstractions = self.framework._cur.fetchall()
+                                        *([formatValue] if formatValue != None else []),
+                                        *dataMatchParameters]))
+        matchingAbstractions = self.cursor.fetchall()
+        self.lastNumberOfScannedRows = len(matchingAbstractions)
         for matchingAbstraction in matchingAbstractions:
             if matchingAbstraction[1] == None or matchingAbstraction[2] == None:
                 continue
+            if self.dataMatch != None and not matchesData(self.dataMatch, matchingAbstraction[1]):
+                continue
             yield {**({self.param : matchingAbstraction[0]} if type(self.param) == str else {}),
-                   **({self.data[0] : matchingAbstraction[1]} if type(self.data) == list else {}),
+                   **({self.dataParameterName : matchingAbstraction[1]} if self.dataParameterName != None else {}),
                    **({self.format[0] : matchingAbstraction[2]} if type(self.format) == list else {})}
+    def getParameterValuesOfChange(self, event):
+        """
+        Returns the parameter values of the results that the created or deleted abstraction of the change event can add or remove.
+        """
+        if event.get("data") == None or (type(self.data) == str and self.data != event["data"]) or (type(self.format) == str and self.format != event["format"]) or (self.dataMatch != None and not matchesData(self.dataMatch, event["data"])):
+            return []
+        valueParameters = [(parameter, value) for parameter, value in ((self.dataParameterName, event["data"]), (self.format[0] if type(self.format) == list else None, event["format"])) if parameter != None]
+        parameterValues = getParameterValuesOfMatch([self.param, *[parameter for parameter, value in valueParameters]], [event["key"], *[value for parameter, value in valueParameters]])
+        return [] if parameterValues == None else [parameterValues]
 
 class ConstructedSearchModule:
-    def __init__(self, param, baseConnections, connectionIndex, exactNumberOfBaseConnections, framework):
+    def __init__(self, param, baseConnections, connectionIndex, exactNumberOfBaseConnections, framework, cursor = None):
         self.framework = framework
+        self.cursor = framework._cur if cursor == None else cursor
         self.param = param
         self.baseConnections = baseConnections
         self.connectionIndex = connectionIndex
@@ -266,14 +820,22 @@ class ConstructedSearchModule:
         self.pred = self.pred if type(self.pred) != 0 else param
         self.obj = self.obj if type(self.obj) != 0 else param
         self.parameterNames = ({param} if type(param) == str else set()) | ({self.subj} if type(self.subj) == str else set()) | ({self.pred} if type(self.pred) == str else set()) | ({self.obj} if type(self.obj) == str else set())
+        # The results also depend on the parameters of the other base connections, because their triples can not be matched again
+        self.dependencyParameterNames = self.parameterNames | set([item for baseConnection in baseConnections for item in baseConnection if type(item) == str])
+        self.allowsFullScan = len(baseConnections) == 1 and len(self.parameterNames) == (type(param) == str) + len([item for item in baseConnections[connectionIndex] if type(item) == str])
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"ConstructedSearchModule({self.param!r}, {self.subj!r}, {self.pred!r}, {self.obj!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        return estimateNumberOfMatchingTriples(self.cursor, {"subject": self.subj, "predicate": self.pred, "object": self.obj, "owner": self.param}, knownParameterNames)
     def search(self, knownParameters):
         subjValue = self.subj.id if type(self.subj) == SQLiteAbstraction else knownParameters.get(self.subj, None)
         predValue = self.pred.id if type(self.pred) == SQLiteAbstraction else knownParameters.get(self.pred, None)
         objValue = self.obj.id if type(self.obj) == SQLiteAbstraction else knownParameters.get(self.obj, None)
         ownerValue = self.param.id if type(self.param) == SQLiteAbstraction else knownParameters.get(self.param, None)
-        self.framework._cur.execute("SELECT subject, predicate, object, owner FROM triples" + (" WHERE " if (subjValue, predValue, objValue, ownerValue) != (None, None, None, None) else "") +
+        self.cursor.execute("SELECT subject, predicate, object, owner FROM triples" + (" WHERE " if (subjValue, predValue, objValue, ownerValue) != (None, None, None, None) else "") +
                                     " AND ".join([
                                         *(["subject = ?"] if subjValue != None else []), 
                                         *(["predicate = ?"] if predValue != None else []), 
@@ -284,7 +846,8 @@ class ConstructedSearchModule:
                                         *([predValue] if predValue != None else []), 
                                         *([objValue] if objValue != None else []), 
                                         *([ownerValue] if ownerValue != None else [])]))
-        matchingTriples = self.framework._cur.fetchall()
+        matchingTriples = self.cursor.fetchall()
+        self.lastNumberOfScannedRows = len(matchingTriples)
         if len(matchingTriples) == 0:
             return
         # Create the set of already matched triples
@@ -300,8 +863,8 @@ class ConstructedSearchModule:
         for matchingTriple in matchingTriples:
             # If the owner got a new value, check if there is an exact number of base connections
             if ownerValue == None and self.exactNumberOfBaseConnections:
-                self.framework._cur.execute("SELECT COUNT(*) FROM triples WHERE owner = ?", (matchingTriple[3],))
-                if self.framework._cur.fetchone()[0] != len(self.baseConnections):
+                self.cursor.execute("SELECT COUNT(*) FROM triples WHERE owner = ?", (matchingTriple[3],))
+                if self.cursor.fetchone()[0] != len(self.baseConnections):
                     continue
             # Check if the triple is already matched
             if (matchingTriple[0], matchingTriple[1], matchingTriple[2]) in alreadyMatchedTriples:
@@ -310,21 +873,35 @@ class ConstructedSearchModule:
                    **({self.pred : matchingTriple[1]} if type(self.pred) == str else {}),
                    **({self.obj : matchingTriple[2]} if type(self.obj) == str else {}),
                    **({self.param : matchingTriple[3]} if type(self.param) == str else {})}
+    def getParameterValuesOfChange(self, event):
+        # The number of base connections is not checked again for a known owner
+        if self.exactNumberOfBaseConnections and len(event.get("triples", [])) != len(self.baseConnections):
+            return []
+        return [parameterValues for parameterValues in [getParameterValuesOfMatch((self.subj, self.pred, self.obj, self.param), (*triple, event["key"])) for triple in event.get("triples", [])] if parameterValues != None]
 
 class TripleSearchModule:
-    def __init__(self, subj, pred, obj, framework):
+    def __init__(self, subj, pred, obj, framework, cursor = None):
         self.subj = subj
         self.pred = pred
         self.obj = obj
         self.framework = framework
+        self.cursor = framework._cur if cursor == None else cursor
         self.parameterNames = ({subj} if type(subj) == str else set()) | ({pred} if type(pred) == str else set()) | ({obj} if type(obj) == str else set())
+        # The results only depend on the own parameters and can be joined with a full scan if no parameter is repeated
+        self.dependencyParameterNames = self.parameterNames
+        self.allowsFullScan = len(self.parameterNames) == len([item for item in (subj, pred, obj) if type(item) == str])
+        self.lastNumberOfScannedRows = 0
+    def __repr__(self):
+        return f"TripleSearchModule({self.subj!r}, {self.pred!r}, {self.obj!r})"
     def getUndefinednessIndex(self, knownParameters):
         return len([parameter for parameter in self.parameterNames if parameter not in knownParameters])
+    def estimateNumberOfRows(self, knownParameterNames):
+        return estimateNumberOfMatchingTriples(self.cursor, {"subject": self.subj, "predicate": self.pred, "object": self.obj}, knownParameterNames)
     def search(self, knownParameters):
         subjValue = self.subj.id if type(self.subj) == SQLiteAbstraction else knownParameters.get(self.subj, None)
         predValue = self.pred.id if type(self.pred) == SQLiteAbstraction else knownParameters.get(self.pred, None)
         objValue = self.obj.id if type(self.obj) == SQLiteAbstraction else knownParameters.get(self.obj, None)
-        self.framework._cur.execute("SELECT subject, predicate, object FROM triples" + (" WHERE " if (subjValue, predValue, objValue) != (None, None, None) else "") +
+        self.cursor.execute("SELECT subject, predicate, object FROM triples" + (" WHERE " if (subjValue, predValue, objValue) != (None, None, None) else "") +
                                                         " AND ".join([
                                                             *(["subject = ?"] if subjValue != None else []), 
                                                             *(["predicate = ?"] if predValue != None else []), 
@@ -333,17 +910,34 @@ class TripleSearchModule:
                                                             *([subjValue] if subjValue != None else []), 
                                                             *([predValue] if predValue != None else []), 
                                                             *([objValue] if objValue != None else [])]))
-        matchingTriples = self.framework._cur.fetchall()
+        matchingTriples = self.cursor.fetchall()
+        self.lastNumberOfScannedRows = len(matchingTriples)
         for matchingTriple in matchingTriples:
             yield {**({self.subj : matchingTriple[0]} if type(self.subj) == str else {}),
                    **({self.pred : matchingTriple[1]} if type(self.pred) == str else {}),
                    **({self.obj : matchingTriple[2]} if type(self.obj) == str else {})}
+    def getParameterValuesOfChange(self, event):
+        return [parameterValues for parameterValues in [getParameterValuesOfMatch((self.subj, self.pred, self.obj), triple) for triple in event.get("triples", [])] if parameterValues != None]
                 
         
                                    
-def searchAllSearchModules(searchModules, knownParameters):
+def getParameterValuesOfMatch(items, values):
+    """
+    Returns the parameter values that make the items, which are parameter names, abstractions or 0 for any value, match the ids or values or None if they can not match.
+    """
+    parameterValues = {}
+    for item, value in zip(items, values):
+        if type(item) == str:
+            if parameterValues.setdefault(item, value) != value:
+                return None
+        elif type(item) == SQLiteAbstraction and item.id != value:
+            return None
+    return parameterValues
+
+def searchAllSearchModules(searchModules, knownParameters, profile = None):
     """
     Return all filled parameter combinations for the given modules.
+    If a SearchProfile is given, the statistics of the module searches are recorded in it.
     """
     # If there are no modules yield the known parameters
     if len(searchModules) == 0:
@@ -358,13 +952,135 @@ def searchAllSearchModules(searchModules, knownParameters):
             smallestUndefinednessIndex = undefinednessIndex
             moduleWithSmallestNumberOfUnknownParameters = searchModule
     # Iterate through all possible values for the unknown parameters of the module
-    for parameterValues in moduleWithSmallestNumberOfUnknownParameters.search(knownParameters):
+    results = moduleWithSmallestNumberOfUnknownParameters.search(knownParameters) if profile == None else profile.profileModuleSearch(moduleWithSmallestNumberOfUnknownParameters, knownParameters, len(searchModules))
+    for parameterValues in results:
         # Add the parameter values to the known parameters
         newKnownParameters = knownParameters | parameterValues
         # Recursively search for the remaining modules
-        for newKnownParameters in searchAllSearchModules([searchModule for searchModule in searchModules if searchModule != moduleWithSmallestNumberOfUnknownParameters], newKnownParameters):
+        for newKnownParameters in searchAllSearchModules([searchModule for searchModule in searchModules if searchModule != moduleWithSmallestNumberOfUnknownParameters], newKnownParameters, profile):
             yield newKnownParameters
 
+def getSnapshotAbstractionGetter(RALFramework, cursor):
+    """
+    Returns a function that returns the abstraction of an id read with the snapshot cursor.
+    The hashes are only compared once per distinct id, so the abstraction of each id is kept until the end of the search.
+    """
+    abstractionsByID = {}
+    def getAbstraction(id):
+        if id not in abstractionsByID:
+            abstractionsByID[id] = RALFramework._getAbstractionWrapperFromSnapshotID(id, cursor)
+        return abstractionsByID[id]
+    return getAbstraction
+
+def getResultParameters(searchModules, knownParameters):
+    """
+    Returns the default order of the result parameters: all parameter names of the search sorted.
+    """
+    return sorted(set(knownParameters).union(*[searchModule.parameterNames for searchModule in searchModules]))
+
+def collectResultColumns(rows, parameters, valueParameters, asNumpyArrays = False):
+    """
+    Collects the result rows into a dict with one column per parameter.
+    The columns of the valueParameters (data and format values) are lists and all other columns are array("q") of abstraction ids or numpy arrays if asNumpyArrays is True.
+    """
+    columns = [[] if parameter in valueParameters else array("q") for parameter in parameters]
+    appends = [column.append for column in columns]
+    for row in rows:
+        for append, value in zip(appends, row):
+            append(value)
+    if asNumpyArrays:
+        numpy = importNumpy()
+        columns = [numpy.array(column, dtype = object) if parameter in valueParameters else numpy.asarray(column, dtype = numpy.int64) for parameter, column in zip(parameters, columns)]
+    return dict(zip(parameters, columns))
+
+def constructedAbstractionHashFromTripleHashes(tripleHashes):
+    """
+    Returns the structural hash of a constructed abstraction from its "|" separated triples of "," separated hashes, where "-" is the self-connection.
+    """
+    return constructedAbstractionHash([[0 if item == "-" else item for item in triple.split(",")] for triple in tripleHashes.split("|")])
+
+def assignRALJLevel(RALFramework, level):
+    """
+    Assigns the level to the staged constructed abstractions of importRALJData whose base abstractions all have lower levels.
+    Returns if any abstraction got the level.
+    """
+    # Every abstraction above the first level is built on an abstraction of the previous level
+    RALFramework._cur.execute("UPDATE importedNodes SET level = ? WHERE level IS NULL" +
+                              ("" if level == 1 else " AND jsonNodeID IN (SELECT importedReferences.owner FROM importedReferences JOIN importedNodes AS base ON base.jsonNodeID = importedReferences.reference WHERE base.level = ?)") +
+                              " AND NOT EXISTS (SELECT 1 FROM importedReferences JOIN importedNodes AS base ON base.jsonNodeID = importedReferences.reference WHERE importedReferences.owner = importedNodes.jsonNodeID AND (base.level IS NULL OR base.level >= ?))",
+                              (level, level) if level == 1 else (level, level - 1, level))
+    return RALFramework._cur.rowcount > 0
+
+def importRALJLevel(RALFramework, level, largestIdBefore):
+    """
+    Inserts the staged abstractions of importRALJData with the level that do not exist yet and stores the ids of all of them.
+    """
+    cur = RALFramework._cur
+    baseJoins = "".join([f" LEFT JOIN importedNodes AS {column}Node ON {column}Node.jsonNodeID = importedTriples.{column}" for column in ["subject", "predicate", "object"]])
+    if level == 0:
+        cur.execute("UPDATE importedNodes SET hash = dataAbstractionHash(data, format) WHERE level = 0")
+    else:
+        cur.execute("UPDATE importedNodes SET hash = (SELECT constructedAbstractionHash(group_concat(COALESCE(subjectNode.hash, '-') || ',' || COALESCE(predicateNode.hash, '-') || ',' || COALESCE(objectNode.hash, '-'), '|')) FROM importedTriples" + baseJoins +
+                    " WHERE importedTriples.owner = importedNodes.jsonNodeID) WHERE level = ?", (level,))
+    # Abstractions that already exist are not inserted again and equal abstractions of the RALJ data are inserted once
+    cur.execute("UPDATE importedNodes SET id = (SELECT id FROM abstractions WHERE hash = importedNodes.hash) WHERE level = ?", (level,))
+    if level == 0:
+        cur.execute("INSERT INTO abstractions (data, format, connections, remember, hash) SELECT data, format, NULL, 0, hash FROM importedNodes WHERE level = 0 AND id IS NULL GROUP BY hash")
+    else:
+        cur.execute("INSERT INTO abstractions (data, format, connections, remember, hash) SELECT NULL, NULL, (SELECT group_concat(triple, '|') FROM (SELECT DISTINCT COALESCE(subjectNode.id, '-') || ',' || COALESCE(predicateNode.id, '-') || ',' || COALESCE(objectNode.id, '-') AS triple FROM importedTriples" + baseJoins +
+                    " WHERE importedTriples.owner = importedNodes.jsonNodeID ORDER BY triple)), 0, hash FROM importedNodes WHERE level = ? AND id IS NULL GROUP BY hash", (level,))
+    cur.execute("UPDATE importedNodes SET id = (SELECT id FROM abstractions WHERE hash = importedNodes.hash) WHERE level = ? AND id IS NULL", (level,))
+    if level > 0:
+        cur.execute("INSERT INTO triples (subject, predicate, object, owner) SELECT DISTINCT COALESCE(subjectNode.id, importedNodes.id), COALESCE(predicateNode.id, importedNodes.id), COALESCE(objectNode.id, importedNodes.id), importedNodes.id FROM importedNodes JOIN importedTriples ON importedTriples.owner = importedNodes.jsonNodeID" + baseJoins +
+                    " WHERE importedNodes.level = ? AND importedNodes.id > ?", (level, largestIdBefore))
+
+def estimateNumberOfMatchingTriples(cursor, valuesByColumn, knownParameterNames):
+    """
+    Estimates the number of triples that match one combination of known parameter values with the cursor.
+    valuesByColumn maps the triple columns to eather a parameter name or an abstraction.
+    """
+    return estimateNumberOfMatchingRows(cursor, "triples", [],
+        {column : value.id for column, value in valuesByColumn.items() if type(value) == SQLiteAbstraction},
+        [column for column, value in valuesByColumn.items() if type(value) == str and value in knownParameterNames])
+
+def estimateNumberOfMatchingRows(cursor, table, conditions, constantValuesByColumn, knownColumns, conditionParameters = []):
+    """
+    Estimates the number of rows of the table that match the conditions with their conditionParameters, the constant values and one combination of values of the known columns with the cursor.
+    """
+    conditions = [*conditions, *[column + " = ?" for column in constantValuesByColumn]]
+    res = cursor.execute("SELECT " + ", ".join(["COUNT(*)", *["COUNT(DISTINCT " + column + ")" for column in knownColumns]]) + " FROM " + table + (" WHERE " + " AND ".join(conditions) if len(conditions) > 0 else ""),
+                                    tuple([*conditionParameters, *constantValuesByColumn.values()])).fetchone()
+    return estimateNumberOfRows(res[0], res[1:])
+
+
+def updateMissingAbstractionHashes(RALFramework):
+    """
+    Computes the structural hashes of all abstractions in the sqlite database that do not have one yet.
+    """
+    rows = {id : (data, format, connections, hash) for id, data, format, connections, hash in RALFramework._cur.execute("SELECT id, data, format, connections, hash FROM abstractions").fetchall()}
+    hashes = {id : row[3] for id, row in rows.items() if row[3] != None}
+    updatedHashes = []
+    for id in rows:
+        # Compute the hashes of the base abstractions before the hash of the abstraction itself
+        stack = [id]
+        while len(stack) > 0:
+            currentId = stack[-1]
+            if currentId in hashes:
+                stack.pop()
+                continue
+            data, format, connections, _ = rows[currentId]
+            if data != None:
+                hashes[currentId] = dataAbstractionHash(data, format)
+            else:
+                triples = [[0 if element == "-" else int(element) for element in triple.split(",")] for triple in connections.split("|")]
+                missingIds = [element for triple in triples for element in triple if element != 0 and element not in hashes]
+                if len(missingIds) > 0:
+                    stack.extend(missingIds)
+                    continue
+                hashes[currentId] = constructedAbstractionHash([[0 if element == 0 else hashes[element] for element in triple] for triple in triples])
+            updatedHashes.append((hashes[currentId], currentId))
+            stack.pop()
+    RALFramework._cur.executemany("UPDATE abstractions SET hash = ? WHERE id = ?", updatedHashes)
 
 def checkForSafeAbstractionDeletion(id, RALFramework):
     """
@@ -372,7 +1088,8 @@ def checkForSafeAbstractionDeletion(id, RALFramework):
     Returns a set of the abstraction ids that should also be checked for safe deletion.
     """
     # Check if the abstraction is remembered
-    if RALFramework._cur.execute("SELECT remember FROM abstractions WHERE id = ?", (id,)).fetchone()[0] != 0:
+    remember, data, format = RALFramework._cur.execute("SELECT remember, data, format FROM abstractions WHERE id = ?", (id,)).fetchone()
+    if remember != 0:
         return set()
     # Check if tere is a active wrapper for the abstraction
     wrapper = RALFramework._wrappersByAbstractionID.get(id)
@@ -396,9 +1113,19 @@ def checkForSafeAbstractionDeletion(id, RALFramework):
     # Delete the abstraction
     RALFramework._cur.execute("DELETE FROM abstractions WHERE id = ?", (id,))
     RALFramework._conn.commit()
+    RALFramework._counters.increment("deletedAbstractions")
+    RALFramework._emitChange("nodeDeleted", id, data, format, [tuple(triple[1:4]) for triple in triples])
     # Return the connected abstractions
     return connectedAbstractions
 
+def countCascadedDeletions(RALFramework, numberOfDeletedAbstractionsBefore):
+    """
+    Counts all but the first abstraction deleted since numberOfDeletedAbstractionsBefore as cascaded deletions.
+    """
+    numberOfCascadedDeletions = RALFramework._counters.get("deletedAbstractions") - numberOfDeletedAbstractionsBefore - 1
+    if numberOfCascadedDeletions > 0:
+        RALFramework._counters.increment("cascadedDeletions", numberOfCascadedDeletions)
+
 def forceAbstractionDeletion(id, RALFramework):
     """
     Forces the deletion of the abstraction with the given id from the neo4j database.
@@ -406,10 +1133,7 @@ def forceAbstractionDeletion(id, RALFramework):
     """
     # Unset the remembered flag
     RALFramework._cur.execute("UPDATE abstractions SET remember = 0 WHERE id = ?", (id,))
-    # Deactivate the active wrapper for the abstraction if there is one
-    wrapper = RALFramework._wrappersByAbstractionID.get(id)
-    if wrapper != None:
-        wrapper._id = None
+    deactivateAbstractionWrapper(id, RALFramework)
     forcedDeletionIds = set()
     # Get all the connected AbstractionTriples
     connectedTriples = RALFramework._cur.execute("SELECT owner FROM triples WHERE subject = ? OR predicate = ? OR object = ?", (id, id, id)).fetchall()
@@ -418,4 +1142,73 @@ def forceAbstractionDeletion(id, RALFramework):
         forcedDeletionIds.add(connectedTriple[0])
     # Return the forcedDeletionIds
     return forcedDeletionIds
-    
\ No newline at end of file
+    
+
+# The following functions are shared by the sqlite backends (SQLiteRALFramework and ShardedRALFramework).
+# They only use the _wrappersByAbstractionID, _counters and _getAbstractionWrapperFromID of the framework.
+
+def createNodeFromArguments(RALFramework, args):
+    """
+    Implements the Node method of a framework: (data), (data, format) or (baseConnections).
+    """
+    if type(args[0]) == str:
+        if len(args) == 1:
+            return RALFramework.DirectDataAbstraction(args[0], "text")
+        if len(args) == 2:
+            return RALFramework.DirectDataAbstraction(args[0], args[1])
+    if type(args[0]) == list:
+        return RALFramework.ConstructedAbstraction(args[0])
+
+def getAbstractionWrapper(id, RALFramework, wrapperClass):
+    """
+    Returns the active wrapper of the abstraction id or creates a new wrapper of the given class.
+    """
+    if id in RALFramework._wrappersByAbstractionID:
+        return RALFramework._wrappersByAbstractionID[id]
+    wrapper = wrapperClass(id, RALFramework)
+    RALFramework._wrappersByAbstractionID[id] = wrapper
+    RALFramework._counters.increment("wrapperCreations")
+    return wrapper
+
+def deactivateAbstractionWrapper(id, RALFramework):
+    """
+    Deactivates the active wrapper of the abstraction id if there is one, so that a reused id gets a new wrapper.
+    """
+    wrapper = RALFramework._wrappersByAbstractionID.pop(id, None)
+    if wrapper != None:
+        wrapper._id = None
+
+def parseConnectionRepresentation(connections, RALFramework):
+    """
+    Returns the frozenset of base connection triples of the "|" and "," separated connections column.
+    """
+    triples = connections.split("|")
+    triples = [tuple([0 if element == "-" else RALFramework._getAbstractionWrapperFromID(int(element)) for element in triple.split(",")]) for triple in triples]
+    return frozenset(triples)
+
+def deleteAbstractionSafely(id, RALFramework, checkForSafeDeletion):
+    """
+    Deletes the abstraction id and all abstractions that are only kept alive by it, as far as checkForSafeDeletion allows.
+    """
+    numberOfDeletedAbstractions = RALFramework._counters.get("deletedAbstractions")
+    idsToCheckForDeletion = set([id])
+    while len(idsToCheckForDeletion) > 0:
+        id = idsToCheckForDeletion.pop()
+        idsToCheckForDeletion |= checkForSafeDeletion(id, RALFramework)
+    countCascadedDeletions(RALFramework, numberOfDeletedAbstractions)
+
+def forceAbstractionDeletionCascade(id, RALFramework, forceDeletion, checkForSafeDeletion):
+    """
+    Forces the deletion of the abstraction id and of all abstractions that use it and safely deletes the abstractions that are no longer used afterwards.
+    """
+    forcedDeletionIds = {id}
+    safeDeletionIds = set()
+    numberOfDeletedAbstractions = RALFramework._counters.get("deletedAbstractions")
+    while len(forcedDeletionIds) > 0:
+        id = forcedDeletionIds.pop()
+        safeDeletionIds.add(id)
+        forcedDeletionIds |= forceDeletion(id, RALFramework).difference(safeDeletionIds)
+    while len(safeDeletionIds) > 0:
+        id = safeDeletionIds.pop()
+        safeDeletionIds |= checkForSafeDeletion(id, RALFramework)
+    countCascadedDeletions(RALFramework, numberOfDeletedAbstractions)
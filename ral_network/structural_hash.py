@@ -0,0 +1,21 @@
+# Content-addressed structural hashes for abstractions.
+# The hash of a direct data abstraction only depends on its data and format.
+# The hash of a constructed abstraction only depends on the hashes of the abstractions in its base connections,
+# so equal abstractions in different RAL frameworks always have the same hash.
+
+from hashlib import sha256
+import json
+
+def dataAbstractionHash(data, format):
+    """
+    Returns the structural hash of the direct data abstraction with the given data and format.
+    """
+    return sha256(("d" + json.dumps([data, format])).encode("utf-8")).hexdigest()
+
+def constructedAbstractionHash(connectionHashes):
+    """
+    Returns the structural hash of a constructed abstraction.
+    connectionHashes is an iterable of triples where each item is eather 0 (the self-connection) or the structural hash of the connected abstraction.
+    """
+    tripleRepresentations = sorted(set([tuple(["-" if item == 0 else item for item in triple]) for triple in connectionHashes]))
+    return sha256(("c" + "|".join([",".join(triple) for triple in tripleRepresentations])).encode("utf-8")).hexdigest()
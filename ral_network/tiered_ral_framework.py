@@ -0,0 +1,226 @@
+# A RAL framework that keeps its recently used nodes in memory and stores the whole network in a sqlite database.
+# New nodes are written to the database in batches. Nodes that are not in memory are loaded from the database when they are accessed.
+# Once a node is written to the database, the database holds it and its remembered flag. The node is dropped from memory when it
+# is evicted and no longer used, which keeps its abstraction in the database. Only forceDeletion deletes it from the database.
+# The framework has no change events (onChange) and therefore no materialized views, because the collection of an evicted node
+# would be reported as a deletion although the node is still stored in the database. The store has both.
+
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+from .ral_framework import RALFramework, _RALNode, depthFirstPostOrder
+from .sqlite_ral_framework import SQLiteRALFramework, SQLiteAbstraction, deactivateAbstractionWrapper
+
+class TieredRALFramework(RALFramework):
+    def __init__(self, db_path, memoryBudget = 10000, flushBatchSize = 1000):
+        """
+        memoryBudget is the number of nodes that are kept in memory besides the pending new nodes. The least recently used nodes are evicted first.
+        Nodes that are referenced elsewhere stay in memory together with the nodes they are built on.
+        New nodes are written to the sqlite database at db_path as soon as flushBatchSize of them are pending, before searches and on close.
+        """
+        super().__init__()
+        self._store = SQLiteRALFramework(db_path)
+        self._memoryBudget = memoryBudget
+        self._flushBatchSize = flushBatchSize
+        self._pendingNodes = {}
+        self._recentlyUsedNodes = OrderedDict()
+        self._storeAbstractionsByNode = WeakKeyDictionary()
+        self._numberOfActiveSearches = 0
+
+    @property
+    def counters(self):
+        """
+        The framework wide counters "nodeCreations", "deletedNodes", "cascadedDeletions", "flushedNodes", "loadedNodes" and "evictedNodes".
+        The counters of the sqlite database are available at store.counters.
+        """
+        return self._counters
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def onChange(self):
+        """
+        Not available, because a node that is evicted from memory and collected is still stored in the database. Use store.onChange instead.
+        """
+        raise AttributeError("The TieredRALFramework has no change events. Use the onChange of its store instead.")
+
+    @property
+    def materializedView(self):
+        """
+        Not available, because materialized views are updated with the change events. Use store.materializedView instead.
+        """
+        raise AttributeError("The TieredRALFramework has no materialized views. Use the materializedView of its store instead.")
+
+    def Node(self, *args):
+        node = super().Node(*args)
+        self._touch(node)
+        return node
+
+    def _createNode(self, content, isDataNode, hash):
+        # The node might only be stored in the database
+        storeAbstraction = self._store.getAbstractionFromHash(hash)
+        if storeAbstraction != None:
+            return self._loadNode(storeAbstraction)
+        node = _RALNode(content, isDataNode, self, hash)
+        self._pendingNodes[hash] = node
+        if len(self._pendingNodes) >= self._flushBatchSize:
+            self.flush()
+        return node
+
+    def _nodeDeleted(self, node, forced):
+        self._pendingNodes.pop(node.hash, None)
+        self._recentlyUsedNodes.pop(node.hash, None)
+        # A forced deletion is forwarded to the database. A collected node only leaves memory, so its wrapper must not delete the abstraction savely.
+        storeAbstraction = self._storeAbstractionsByNode.pop(node, None)
+        if storeAbstraction != None:
+            if forced:
+                storeAbstraction.forceDeletion()
+            elif not storeAbstraction.isDeleted:
+                deactivateAbstractionWrapper(storeAbstraction.id, self._store)
+
+    def _rememberedChanged(self, node):
+        storeAbstraction = self._storeAbstractionsByNode.get(node)
+        if storeAbstraction != None:
+            storeAbstraction.remembered = node.remembered
+            # The database keeps the remembered node, so it can be evicted from memory
+            self._rememberedNodes.discard(node)
+
+    def _touch(self, node):
+        """
+        Marks the node as recently used and evicts the least recently used nodes that exceed the memory budget.
+        """
+        self._recentlyUsedNodes[node.hash] = node
+        self._recentlyUsedNodes.move_to_end(node.hash)
+        # Evicted nodes that are not remembered or used get deleted, so nothing is evicted while a search still has to visit them
+        if self._numberOfActiveSearches == 0:
+            self._evictLeastRecentlyUsedNodes()
+
+    def _evictLeastRecentlyUsedNodes(self):
+        # An evicted node is collected together with the base nodes that only it uses, unless it is used elsewhere
+        while len(self._nodes) - len(self._pendingNodes) > self._memoryBudget and len(self._recentlyUsedNodes) > 0:
+            self._recentlyUsedNodes.popitem(last = False)
+            self._counters.increment("evictedNodes")
+
+    def flush(self):
+        """
+        Writes all pending new nodes to the sqlite database with a single commit.
+        """
+        if len(self._pendingNodes) == 0:
+            return
+        pendingNodes = self._pendingNodes
+        self._pendingNodes = {}
+        # The base nodes of a node have to be written before the node itself
+        nodes = depthFirstPostOrder(pendingNodes.values(), lambda node: [] if node._isDataNode else [item for connection in node.content for item in connection if item != 0 and item.hash in pendingNodes])
+        getKey = lambda item: 0 if item == 0 else item.hash if item.hash in pendingNodes else self._storeAbstractionsByNode[item].id
+        idsByHash = self._store._createAbstractionsFromRecords([(node.hash, node.data, node.format, None if node._isDataNode else [[getKey(item) for item in connection] for connection in node.content]) for node in nodes])
+        for node in nodes:
+            self._storeAbstractionsByNode[node] = self._store._getAbstractionWrapperFromID(idsByHash[node.hash])
+        rememberedIds = [(idsByHash[node.hash],) for node in nodes if node.remembered]
+        if len(rememberedIds) > 0:
+            self._store._cur.executemany("UPDATE abstractions SET remember = 1 WHERE id = ?", rememberedIds)
+            self._store._conn.commit()
+        self._rememberedNodes.difference_update(nodes)
+        self._counters.increment("flushedNodes", len(nodes))
+
+    def _loadNode(self, storeAbstraction):
+        """
+        Returns the node of the database abstraction and loads it together with its missing base nodes into memory.
+        """
+        node = self._nodesByHash.get(storeAbstraction.hash)
+        if node is None:
+            # The loaded base nodes are kept alive by the list until the node itself references them
+            nodes = []
+            for baseAbstraction in self._store.closure([storeAbstraction]):
+                node = self._nodesByHash.get(baseAbstraction.hash)
+                nodes.append(node if node is not None else self._createNodeFromStoreAbstraction(baseAbstraction))
+            node = nodes[-1]
+        self._touch(node)
+        return node
+
+    def _createNodeFromStoreAbstraction(self, storeAbstraction):
+        content = storeAbstraction.content
+        isDataNode = type(content) == tuple
+        if not isDataNode:
+            content = frozenset([tuple([0 if item == 0 else self._nodesByHash[item.hash] for item in connection]) for connection in content])
+        node = _RALNode(content, isDataNode, self, storeAbstraction.hash)
+        self._storeAbstractionsByNode[node] = storeAbstraction
+        # The database keeps the remembered flag, so the node is not added to the remembered nodes in memory
+        node._remembered = storeAbstraction.remembered
+        self._counters.increment("loadedNodes")
+        return node
+
+    def getAbstractionFromHash(self, hash):
+        node = self._nodesByHash.get(hash)
+        if node is None:
+            storeAbstraction = self._store.getAbstractionFromHash(hash)
+            if storeAbstraction == None:
+                return None
+            node = self._loadNode(storeAbstraction)
+        return node
+
+    def _toStoreValue(self, value):
+        if type(value) == _RALNode:
+            return self._storeAbstractionsByNode[value]
+        return value
+
+    def _toStorePattern(self, triples, data, constructed):
+        self.flush()
+        triples = [[self._toStoreValue(item) for item in triple] for triple in triples]
+        constructed = {self._toStoreValue(param) : [baseConnection if baseConnection == "+" else [self._toStoreValue(item) for item in baseConnection] for baseConnection in baseConnections] for param, baseConnections in constructed.items()}
+        return triples, data, constructed
+
+    def search(self, triples = [], data = {}, constructed = {}, profile = None, executor = "recursive"):
+        """
+        Yields all parameter combinations that match the pattern in the whole network. The pending nodes are written to the database first.
+        """
+        triples, data, constructed = self._toStorePattern(triples, data, constructed)
+        self._numberOfActiveSearches += 1
+        try:
+            for knownParameters in self._store.search(triples, data, constructed, profile, executor = executor):
+                yield {key : (self._loadNode(value) if type(value) == SQLiteAbstraction else value) for key, value in knownParameters.items()}
+        finally:
+            self._numberOfActiveSearches -= 1
+            if self._numberOfActiveSearches == 0:
+                self._evictLeastRecentlyUsedNodes()
+
+    def explain(self, triples = [], data = {}, constructed = {}):
+        return self._store.explain(*self._toStorePattern(triples, data, constructed))
+
+    def dependents(self, abstractions):
+        """
+        Returns the given nodes and all nodes of the whole network that are built on them in topological order.
+        """
+        self.flush()
+        return [self._loadNode(storeAbstraction) for storeAbstraction in self._store.dependents([self._storeAbstractionsByNode[node] for node in abstractions])]
+
+    def getAllNodes(self):
+        self.flush()
+        return [self._loadNode(storeAbstraction) for storeAbstraction in self._store.getAllNodes()]
+
+    def _getStructuralRecords(self):
+        self.flush()
+        return self._store._getStructuralRecords()
+
+    def _findAbstractionKeysByHashes(self, hashes):
+        self.flush()
+        return {hash : self._loadNode(self._store._getAbstractionWrapperFromID(id)) for hash, id in self._store._findAbstractionKeysByHashes(hashes).items()}
+
+    def close(self):
+        self.flush()
+        self._recentlyUsedNodes = OrderedDict()
+        # The nodes that are still in memory stay in the database as well
+        for storeAbstraction in [*self._storeAbstractionsByNode.values()]:
+            if not storeAbstraction.isDeleted:
+                deactivateAbstractionWrapper(storeAbstraction.id, self._store)
+        self._store.close()
+
+    @property
+    def onClose(self):
+        return self._store.onClose
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
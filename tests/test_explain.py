@@ -0,0 +1,16 @@
+import pytest
+from ral_network import RALFramework, SQLiteRALFramework
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_explain_does_not_create_fixed_data_values(backend):
+    framework = RALFramework() if backend == "memory" else SQLiteRALFramework(":memory:")
+    events = []
+    listener = lambda event: events.append(event)
+    framework.onChange.add(listener)
+    steps = framework.explain(triples = [["x", "p", "y"]], data = {"p": ("isA", "select")})
+    framework.onChange.discard(listener)
+    assert len(steps) == 2
+    assert events == []
+    assert framework.getAllNodes() == []
+    if backend == "sqlite":
+        assert framework.checkpoint() == 0
@@ -0,0 +1,20 @@
+import pytest
+from ral_network import RALFramework, SQLiteRALFramework
+
+def createFramework(backend):
+    return RALFramework() if backend == "memory" else SQLiteRALFramework(":memory:")
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_view_finds_a_fixed_data_value_that_is_created_later(backend):
+    framework = createFramework(backend)
+    view = framework.materializedView(triples = [["x", "p", "y"]], data = {"p": ("isA", "select")})
+    assert view.rows == set()
+    likes = framework.Node("likes", "select")
+    a = framework.Node("a")
+    b = framework.Node("b")
+    likedNodes = [framework.Node([[0, likes, a]]), framework.Node([[b, likes, 0]])]
+    assert view.rows == set()
+    isA = framework.Node("isA", "select")
+    concept = framework.Node([[0, isA, a]])
+    assert [(result["x"], result["p"], result["y"]) for result in view.results] == [(concept, isA, a)]
+    view.close()
@@ -0,0 +1,30 @@
+from collections import Counter
+from ral_network import RALFramework, network_transformation, transformAssertedClaimsIntoAbstractClaims, transformAbstractClaimsIntoAssertedClaims
+
+def countTransformations(monkeypatch):
+    numbersOfTransformations = Counter()
+    transformRALNetwork = network_transformation.transformRALNetwork
+    def countingTransformRALNetwork(sourceAbstractions, sourceRALFramework, targetRALFramework, transformationFunction, transformedAbstractions = None):
+        def countingTransformation(sourceAbstraction, sourceRALFramework, targetRALFramework):
+            numbersOfTransformations[sourceAbstraction] += 1
+            return transformationFunction(sourceAbstraction, sourceRALFramework, targetRALFramework)
+        return transformRALNetwork(sourceAbstractions, sourceRALFramework, targetRALFramework, countingTransformation, transformedAbstractions)
+    monkeypatch.setattr(network_transformation, "transformRALNetwork", countingTransformRALNetwork)
+    return numbersOfTransformations
+
+def test_claimed_abstractions_that_are_also_inputs_are_transformed_once(monkeypatch):
+    numbersOfTransformations = countTransformations(monkeypatch)
+    source = RALFramework()
+    isA = source.Node("isA", "select")
+    says = source.Node("says", "select")
+    leaf = source.Node([[0, isA, source.Node("leaf")]])
+    # The inner concept is claimed by both outer concepts and contains a claim itself
+    innerConcept = source.Node([[0, isA, source.Node("inner")], [source.Node("inner claim", "claim"), says, leaf]])
+    outerConcepts = [source.Node([[0, isA, source.Node(f"outer {i}")], [source.Node(f"outer claim {i}", "claim"), says, innerConcept]]) for i in range(2)]
+    target = RALFramework()
+    abstractClaims = transformAssertedClaimsIntoAbstractClaims([*outerConcepts, innerConcept, leaf], source, target)
+    assert len(abstractClaims) == 3
+    assert len(numbersOfTransformations) > 0
+    assert set(numbersOfTransformations.values()) == {1}
+    assertedClaims = transformAbstractClaimsIntoAssertedClaims(abstractClaims, target, RALFramework())
+    assert len(assertedClaims) == 3
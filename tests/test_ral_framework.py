@@ -0,0 +1,42 @@
+import sys
+from ral_network import RALFramework
+
+def test_forceDeletion_deletes_the_nodes_built_on_the_node():
+    framework = RALFramework()
+    next = framework.Node("next", "select")
+    base = framework.Node("chain start")
+    other = framework.Node("other")
+    chain = [base]
+    for i in range(5):
+        chain.append(framework.Node([[chain[-1], next, 0]]))
+    unrelated = framework.Node([[other, next, 0]])
+    base.forceDeletion()
+    assert all([node.isDeleted for node in chain])
+    assert not unrelated.isDeleted and not next.isDeleted and not other.isDeleted
+    assert framework.counters.get("cascadedDeletions") == 5
+    assert set(framework.getAllNodes()) == {next, other, unrelated}
+
+def test_forceDeletion_of_a_predicate_deletes_all_users():
+    framework = RALFramework()
+    isA = framework.Node("isA", "select")
+    concept = framework.Node("concept")
+    users = [framework.Node([[0, isA, concept], [0, isA, framework.Node(f"leaf {i}")]]) for i in range(3)]
+    isA.forceDeletion()
+    assert all([user.isDeleted for user in users])
+    assert not concept.isDeleted
+
+def test_forceDeletion_of_a_long_chain_does_not_exceed_the_recursion_limit():
+    framework = RALFramework()
+    next = framework.Node("next", "select")
+    base = framework.Node("chain start")
+    chain = [base]
+    for i in range(5 * sys.getrecursionlimit()):
+        chain.append(framework.Node([[chain[-1], next, 0]]))
+    events = []
+    listener = lambda event: events.append(event["key"])
+    framework.onChange.add(listener)
+    base.forceDeletion()
+    framework.onChange.discard(listener)
+    assert all([node.isDeleted for node in chain])
+    assert events == chain[::-1]
+    assert set(framework.getAllNodes()) == {next}
@@ -0,0 +1,33 @@
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from ral_network import ShardedRALFramework
+
+def createFramework(tmp_path, numberOfLeaves):
+    framework = ShardedRALFramework([tmp_path / f"shard{i}.sqlite" for i in range(3)], numberOfWorkers = 2, chunkSize = 1)
+    isA = framework.Node("isA", "select")
+    concept = framework.Node("concept")
+    leaves = [framework.Node([[0, isA, concept], [0, isA, framework.Node(f"leaf {i}")]]) for i in range(numberOfLeaves)]
+    for leaf in leaves:
+        leaf.remembered = True
+    return framework, isA, concept
+
+def test_parallel_search_finds_the_results_of_the_sequential_search(tmp_path):
+    framework, isA, concept = createFramework(tmp_path, 20)
+    sequentialResults = sorted([result["n"].id for result in framework.search(triples = [["n", isA, concept]])])
+    parallelResults = sorted([result["n"].id for result in framework.search(triples = [["n", isA, concept]], parallel = True)])
+    assert len(sequentialResults) == 20
+    assert parallelResults == sequentialResults
+    framework.close()
+
+def test_parallel_search_raises_when_a_worker_is_killed(tmp_path):
+    framework, isA, concept = createFramework(tmp_path, 200)
+    results = framework.search(triples = [["n", isA, concept]], parallel = True)
+    next(results)
+    for process in framework._executor._processes.values():
+        process.kill()
+    with pytest.raises(BrokenProcessPool):
+        for result in results:
+            pass
+    # The next parallel search starts new workers
+    assert len(list(framework.search(triples = [["n", isA, concept]], parallel = True))) == 200
+    framework.close()
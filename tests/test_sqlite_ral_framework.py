@@ -0,0 +1,57 @@
+import pytest
+from ral_network import SQLiteRALFramework
+
+ralj = [{"text": {"a": "1", "b": "2"}}, {"3": [["1", "2", 0]]}]
+
+def test_importRALJData_returns_the_requested_abstractions():
+    framework = SQLiteRALFramework(":memory:")
+    abstractions = framework.importRALJData(ralj, ["1", "3"])
+    assert abstractions["1"].data == "a"
+    assert [*abstractions["3"].connections][0][0] == abstractions["1"]
+    del abstractions
+    framework.close()
+
+def test_importRALJData_rejects_unknown_requested_json_nodes():
+    framework = SQLiteRALFramework(":memory:")
+    with pytest.raises(ValueError):
+        framework.importRALJData(ralj, ["1", "4"])
+    assert framework.getAllNodes() == []
+    framework.close()
+
+def test_importRALJData_rejects_json_nodes_defined_twice():
+    framework = SQLiteRALFramework(":memory:")
+    jsonNodeIDs = ["1"]
+    with pytest.raises(ValueError, match = "'1'"):
+        framework.importRALJData([{"text": {"a": "1"}}, {"1": [["1", "1", 0]]}], jsonNodeIDs)
+    assert jsonNodeIDs == ["1"]
+    framework.close()
+
+def createLattice(framework, numberOfLevels):
+    # Every node is built on the two nodes of the level below, so the number of paths doubles with every level
+    next = framework.Node("next", "select")
+    levels = [[framework.Node("left"), framework.Node("right")]]
+    for i in range(numberOfLevels):
+        levels.append([framework.Node([[0, next, levels[-1][0]], [0, next, levels[-1][1]], [0, next, framework.Node(f"{side} {i}")]]) for side in ["left", "right"]])
+    return next, levels
+
+def assertTopologicalOrder(abstractions):
+    positions = {abstraction.id : position for position, abstraction in enumerate(abstractions)}
+    assert len(positions) == len(abstractions)
+    for abstraction in abstractions:
+        if abstraction.type == "constructed":
+            for triple in abstraction.connections:
+                for item in triple:
+                    if item != 0 and item.id in positions:
+                        assert positions[item.id] < positions[abstraction.id]
+
+def test_closure_and_dependents_return_every_abstraction_once():
+    framework = SQLiteRALFramework(":memory:")
+    next, levels = createLattice(framework, 30)
+    closure = framework.closure(levels[-1][:1])
+    assertTopologicalOrder(closure)
+    assert len(closure) == 3 + 2 * (1 + 2 * 29)
+    dependents = framework.dependents(levels[0][:1])
+    assertTopologicalOrder(dependents)
+    assert len(dependents) == 1 + 2 * 30
+    del closure, dependents, next, levels
+    framework.close()
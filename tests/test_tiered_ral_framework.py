@@ -0,0 +1,36 @@
+from ral_network import TieredRALFramework
+
+def createNetwork(framework, numberOfLeaves, remembered):
+    isA = framework.Node("isA", "select")
+    concept = framework.Node("concept")
+    for i in range(numberOfLeaves):
+        framework.Node([[0, isA, concept], [0, isA, framework.Node(f"leaf {i}")]]).remembered = remembered
+    framework.flush()
+    return isA.hash, concept.hash
+
+def test_remembered_nodes_are_evicted_within_the_memory_budget(tmp_path):
+    framework = TieredRALFramework(tmp_path / "tiered.sqlite", memoryBudget = 6, flushBatchSize = 4)
+    isAHash, conceptHash = createNetwork(framework, 30, True)
+    framework._evictLeastRecentlyUsedNodes()
+    assert len(framework._nodes) <= 6
+    assert framework.store._cur.execute("SELECT COUNT(*) FROM abstractions WHERE remember = 1").fetchone()[0] == 30
+    isA = framework.getAbstractionFromHash(isAHash)
+    concept = framework.getAbstractionFromHash(conceptHash)
+    leaves = [result["n"] for result in framework.search(triples = [["n", isA, concept]])]
+    assert len(leaves) == 30
+    assert all([leaf.remembered for leaf in leaves])
+    del leaves
+    framework._evictLeastRecentlyUsedNodes()
+    assert len(framework._nodes) <= 6
+    framework.close()
+
+def test_evicted_nodes_stay_in_the_database(tmp_path):
+    framework = TieredRALFramework(tmp_path / "tiered.sqlite", memoryBudget = 2, flushBatchSize = 4)
+    isAHash, conceptHash = createNetwork(framework, 10, False)
+    framework._evictLeastRecentlyUsedNodes()
+    assert len(framework._nodes) <= 2
+    assert framework.store._cur.execute("SELECT COUNT(*) FROM abstractions").fetchone()[0] == 2 + 10 + 10
+    isA = framework.getAbstractionFromHash(isAHash)
+    concept = framework.getAbstractionFromHash(conceptHash)
+    assert len(list(framework.search(triples = [["n", isA, concept]]))) == 10
+    framework.close()